@@ -0,0 +1,9 @@
+"""JSON parsing with orjson when installed."""
+
+import json
+
+try:
+    # orjson is optional (pip install "sre-agent[fast]"); its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
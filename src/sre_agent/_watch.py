@@ -0,0 +1,39 @@
+"""Pod watch shared by the collector's informer and remediation verification."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from kubernetes import client, watch
+
+
+def watch_pods(
+    core: client.CoreV1Api,
+    namespace: str,
+    resource_version: str,
+    timeout_seconds: int,
+    on_event: Callable[[str, Any], bool],
+) -> str:
+    """
+    Watch pods in namespace from resource_version for up to timeout_seconds, calling
+    on_event(event_type, pod) for each ADDED, MODIFIED or DELETED event; the watch ends early
+    once on_event returns True. Returns the resourceVersion to resume from.
+    ApiException propagates: on 410 Gone the version has expired and the caller must relist.
+    """
+    w = watch.Watch()
+    for event in w.stream(
+        core.list_namespaced_pod,
+        namespace=namespace,
+        resource_version=resource_version,
+        allow_watch_bookmarks=True,
+        timeout_seconds=timeout_seconds,
+    ):
+        if event["type"] == "BOOKMARK":
+            # Bookmark objects are not deserialized; only their resourceVersion matters
+            resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+            continue
+        pod = event["object"]
+        resource_version = pod.metadata.resource_version
+        if on_event(event["type"], pod):
+            w.stop()
+    return resource_version
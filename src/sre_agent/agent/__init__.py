@@ -1,9 +1,10 @@
 """Agent: orchestration of observe → diagnose → remediate → verify."""
 
-from sre_agent.agent.orchestrator import run_agent, print_result, AgentResult
+from sre_agent.agent.orchestrator import run_agent, run_agent_async, print_result, AgentResult
 
 __all__ = [
     "run_agent",
+    "run_agent_async",
     "print_result",
     "AgentResult",
 ]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
 from dataclasses import dataclass, field
+from typing import Any
 
 from rich.console import Console
 from rich.panel import Panel
@@ -12,8 +13,8 @@ from rich.markdown import Markdown
 
 from sre_agent.config import Settings, get_settings
 from sre_agent.observation import ClusterCollector, ClusterSnapshot
-from sre_agent.diagnosis import diagnose, Diagnosis
-from sre_agent.remediation import apply_remediation, verify_healthy
+from sre_agent.diagnosis import close_async_clients, diagnose_async, Diagnosis
+from sre_agent.remediation import apply_remediation, prefetch_deployment, verify_healthy
 from sre_agent.agent.prompts import (
     REPORT_HEADER,
     REPORT_SECTION_DETECTION,
@@ -26,6 +27,17 @@ from sre_agent.agent.prompts import (
 logger = logging.getLogger(__name__)
 
 
+def _percent_template(template: str) -> str:
+    """Convert a str.format template with named fields to the equivalent %-style template."""
+    return template.replace("%", "%%").replace("{", "%(").replace("}", ")s")
+
+
+# Report templates converted once at import instead of re-parsed by str.format on every report
+_DETECTION_TPL = _percent_template(REPORT_SECTION_DETECTION)
+_ACTIONS_TPL = _percent_template(REPORT_SECTION_ACTIONS)
+_VERIFICATION_TPL = _percent_template(REPORT_SECTION_VERIFICATION)
+
+
 @dataclass
 class AgentResult:
     """Result of a full agent run."""
@@ -52,6 +64,25 @@ def run_agent(
     """
     Run the full agent loop: collect snapshot → diagnose → remediate (unless dry_run) → verify → build report.
     """
+
+    async def run() -> AgentResult:
+        try:
+            return await run_agent_async(namespace, dry_run, kubeconfig, context, settings)
+        finally:
+            # Release the LLM client's connections before the loop (and with it the client) ends
+            await close_async_clients()
+
+    return asyncio.run(run())
+
+
+async def run_agent_async(
+    namespace: str | None = None,
+    dry_run: bool | None = None,
+    kubeconfig: str | None = None,
+    context: str | None = None,
+    settings: Settings | None = None,
+) -> AgentResult:
+    """Async variant of run_agent(); Kubernetes reads overlap the LLM call where possible."""
     opts = settings or get_settings()
     ns = namespace or opts.namespace
     do_remediate = not (dry_run if dry_run is not None else opts.dry_run)
@@ -63,11 +94,21 @@ def run_agent(
         namespace=ns,
         kubeconfig=kubeconfig_str,
         context=ctx,
+        cache_ttl=opts.snapshot_cache_ttl,
     )
-    snapshot = collector.collect()
+    snapshot = await collector.collect_async()
+
+    # Diagnose; while the response streams in, read the deployments it targets
+    prefetch: dict[str, asyncio.Task[Any]] = {}
+
+    def on_target(target: str) -> None:
+        if target not in prefetch:
+            prefetch[target] = asyncio.create_task(
+                asyncio.to_thread(prefetch_deployment, target, ns, kubeconfig_str, ctx)
+            )
 
-    # Diagnose
-    diagnosis = diagnose(snapshot, opts)
+    diagnosis = await diagnose_async(snapshot, opts, on_target=on_target if do_remediate else None)
+    prefetched = {d.metadata.name: d for d in await asyncio.gather(*prefetch.values()) if d is not None}
 
     actions_taken: list[tuple[str, bool, str]] = []
     if diagnosis.has_issue and diagnosis.remediation_actions and do_remediate:
@@ -75,44 +116,21 @@ def run_agent(
         for action in diagnosis.remediation_actions:
             if len(actions_taken) >= max_attempts:
                 break
-            success, msg = apply_remediation(action, ns, kubeconfig_str, ctx)
+            success, msg = await asyncio.to_thread(
+                apply_remediation, action, ns, kubeconfig_str, ctx, prefetched=prefetched
+            )
             actions_taken.append((action.description, success, msg))
             if success and action.kind.value != "custom_instruction":
+                # The cached snapshot no longer reflects the cluster
+                collector.invalidate_cache()
                 # Allow cluster to settle before re-checking
-                time.sleep(3)
+                await asyncio.sleep(3)
 
     # Verify (only if we applied at least one remediation)
     verified = False
     verification_message = "Skipped (no remediation applied)."
     if actions_taken or not diagnosis.has_issue:
-        verified, verification_message = verify_healthy(ns, kubeconfig_str, ctx)
-
-    # Build report
-    report_parts = [REPORT_HEADER]
-    if diagnosis.has_issue:
-        evidence_text = "\n".join(f"- {e}" for e in diagnosis.evidence) or "—"
-        report_parts.append(
-            REPORT_SECTION_DETECTION.format(
-                summary=diagnosis.summary,
-                root_cause=diagnosis.root_cause,
-                evidence=evidence_text,
-            )
-        )
-        if actions_taken:
-            actions_text = "\n".join(
-                f"- **{desc}**: {'OK' if ok else 'Failed'} — {msg}"
-                for desc, ok, msg in actions_taken
-            )
-            report_parts.append(REPORT_SECTION_ACTIONS.format(actions=actions_text))
-        elif do_remediate:
-            report_parts.append("\nNo remediation was applied (none suggested or parsing failed).")
-        if not do_remediate:
-            report_parts.append(REPORT_DRY_RUN)
-        report_parts.append(
-            REPORT_SECTION_VERIFICATION.format(verification=verification_message)
-        )
-    else:
-        report_parts.append(REPORT_NO_ISSUE)
+        verified, verification_message = await asyncio.to_thread(verify_healthy, ns, kubeconfig_str, ctx)
 
     result = AgentResult(
         snapshot=snapshot,
@@ -120,11 +138,41 @@ def run_agent(
         actions_taken=actions_taken,
         verified=verified,
         verification_message=verification_message,
-        report="\n".join(report_parts),
+        report=_build_report(diagnosis, actions_taken, do_remediate, verification_message),
     )
     return result
 
 
+def _build_report(
+    diagnosis: Diagnosis,
+    actions_taken: list[tuple[str, bool, str]],
+    do_remediate: bool,
+    verification_message: str,
+) -> str:
+    """Render the markdown report for a run."""
+    if not diagnosis.has_issue:
+        return REPORT_HEADER + "\n" + REPORT_NO_ISSUE
+    report_parts = [
+        REPORT_HEADER,
+        _DETECTION_TPL % {
+            "summary": diagnosis.summary,
+            "root_cause": diagnosis.root_cause,
+            "evidence": "\n".join([f"- {e}" for e in diagnosis.evidence]) or "—",
+        },
+    ]
+    if actions_taken:
+        actions_text = "\n".join(
+            [f"- **{desc}**: {'OK' if ok else 'Failed'} — {msg}" for desc, ok, msg in actions_taken]
+        )
+        report_parts.append(_ACTIONS_TPL % {"actions": actions_text})
+    elif do_remediate:
+        report_parts.append("\nNo remediation was applied (none suggested or parsing failed).")
+    if not do_remediate:
+        report_parts.append(REPORT_DRY_RUN)
+    report_parts.append(_VERIFICATION_TPL % {"verification": verification_message})
+    return "\n".join(report_parts)
+
+
 def print_result(result: AgentResult, console: Console | None = None) -> None:
     """Print agent result to console using Rich."""
     c = console or Console()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -42,12 +43,23 @@ class Settings(BaseSettings):
         description="Model name for diagnosis and remediation reasoning",
     )
     temperature: float = Field(default=0.1, ge=0.0, le=2.0, description="LLM temperature")
+    llm_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Max concurrent LLM requests when diagnosing several snapshots",
+    )
 
     # Agent behavior
     dry_run: bool = Field(
         default=False,
         description="If true, diagnose only; do not apply remediation",
     )
+    snapshot_cache_ttl: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Reuse a cluster snapshot collected within this many seconds (0 disables)",
+    )
     max_remediation_attempts: int = Field(
         default=2,
         ge=1,
@@ -56,6 +68,7 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return validated settings instance."""
+    """Return validated settings instance (environment is read once per process)."""
     return Settings()
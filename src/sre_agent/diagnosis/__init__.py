@@ -1,10 +1,20 @@
 """Diagnosis layer: LLM-based root cause analysis."""
 
-from sre_agent.diagnosis.analyzer import diagnose
+from sre_agent.diagnosis.analyzer import (
+    close_async_clients,
+    diagnose,
+    diagnose_async,
+    diagnose_many,
+    diagnose_many_async,
+)
 from sre_agent.diagnosis.models import Diagnosis, RemediationAction, RemediationKind
 
 __all__ = [
+    "close_async_clients",
     "diagnose",
+    "diagnose_async",
+    "diagnose_many",
+    "diagnose_many_async",
     "Diagnosis",
     "RemediationAction",
     "RemediationKind",
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
-from typing import Any
+import weakref
+from functools import lru_cache
+from typing import Any, Callable
 
-from openai import OpenAI
+from openai import AsyncOpenAI, BadRequestError, OpenAI
+from pydantic import ValidationError
 
+from sre_agent._json import json_loads
 from sre_agent.config import Settings
-from sre_agent.diagnosis.models import Diagnosis, RemediationAction, RemediationKind
+from sre_agent.diagnosis.models import Diagnosis
 from sre_agent.observation.models import ClusterSnapshot
 
 logger = logging.getLogger(__name__)
@@ -49,59 +54,92 @@ If no issue is found, set has_issue to false, summary to "No issue detected", an
 """
 
 
+# Shared, never-mutated system message: an identical leading prefix on every request lets
+# the provider's prefix cache skip re-prefilling the prompt.
+_SYSTEM_MESSAGE: dict[str, str] = {"role": "system", "content": DIAGNOSIS_SYSTEM_PROMPT}
+
+# Routing hint so OpenAI sends requests sharing the system prompt to the same prompt cache
+_PROMPT_CACHE_KEY = "sre-diag-v1"
+
+# Schema-constrained output for providers that support response_format=json_schema.
+# Non-strict: strict mode forbids free-form objects such as RemediationAction.params.
+_DIAGNOSIS_RESPONSE_FORMAT: dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "Diagnosis",
+        "schema": Diagnosis.model_json_schema(),
+        "strict": False,
+    },
+}
+
+# Models that rejected response_format=json_schema (e.g. gpt-4, gpt-3.5-turbo); later requests to
+# them go without it, relying on the prompt + fence parsing as for OpenAI-compatible servers
+_NO_SCHEMA_MODELS: set[str] = set()
+
+# Fallback for models that wrap their JSON in a markdown code fence
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+# A completed "target": "<kind>/<name>" pair in partially streamed JSON
+_TARGET_RE = re.compile(r'"target"\s*:\s*"([^"]+)"')
+
+
+def _client_kwargs(provider: str, base_url: str | None, api_key: str | None) -> dict[str, Any]:
+    """Constructor kwargs for OpenAI/AsyncOpenAI (supports OpenAI and compatible endpoints)."""
+    if provider == "openai_compatible" and base_url:
+        return {"base_url": base_url, "api_key": api_key or "not-needed"}
+    return {"api_key": api_key or ""}
+
+
 def _openai_client(settings: Settings) -> OpenAI:
-    """Build OpenAI client from settings (supports OpenAI and compatible endpoints)."""
-    kwargs: dict[str, Any] = {
-        "model": settings.model,
-        "temperature": settings.temperature,
-    }
-    if settings.llm_provider == "openai_compatible" and settings.openai_base_url:
-        return OpenAI(
-            base_url=settings.openai_base_url,
-            api_key=settings.openai_api_key or "not-needed",
-        )
-    return OpenAI(api_key=settings.openai_api_key or "")
+    """Return a shared OpenAI client for the configured provider and endpoint."""
+    return _cached_openai_client(settings.llm_provider, settings.openai_base_url, settings.openai_api_key)
+
+
+@lru_cache(maxsize=8)
+def _cached_openai_client(provider: str, base_url: str | None, api_key: str | None) -> OpenAI:
+    """Build OpenAI client; reused so its HTTP pool stays warm."""
+    return OpenAI(**_client_kwargs(provider, base_url, api_key))
 
 
 def _parse_llm_json(raw: str) -> dict[str, Any]:
     """Extract JSON from model output, tolerating markdown code blocks."""
+    # Common case (structured output): a bare object, parsed without copying or scanning for fences
+    if raw.startswith("{"):
+        return json_loads(raw)
     text = raw.strip()
     # Remove optional markdown code block
     if text.startswith("```"):
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+        match = _FENCE_RE.search(text)
         if match:
             text = match.group(1).strip()
         else:
             text = text.lstrip("`").strip()
-    return json.loads(text)
+    return json_loads(text)
 
 
-def _parse_remediation_kind(s: str) -> RemediationKind:
-    """Map string to RemediationKind enum."""
-    try:
-        return RemediationKind(s)
-    except ValueError:
-        return RemediationKind.CUSTOM_INSTRUCTION
+def _completion_kwargs(settings: Settings) -> dict[str, Any]:
+    """Provider-specific chat.completions.create kwargs."""
+    if settings.llm_provider == "openai":
+        kwargs: dict[str, Any] = {"extra_body": {"prompt_cache_key": _PROMPT_CACHE_KEY}}
+        if settings.model not in _NO_SCHEMA_MODELS:
+            kwargs["response_format"] = _DIAGNOSIS_RESPONSE_FORMAT
+        return kwargs
+    # OpenAI-compatible servers vary in structured-output support; rely on the prompt + fence parsing.
+    # Servers with automatic prefix caching (e.g. vLLM) reuse the shared system prefix without a hint.
+    return {}
 
 
-def diagnose(snapshot: ClusterSnapshot, settings: Settings) -> Diagnosis:
-    """Run LLM-based diagnosis on a cluster snapshot and return structured Diagnosis."""
-    client = _openai_client(settings)
-    user_content = snapshot.to_diagnostic_text()
-
-    response = client.chat.completions.create(
-        model=settings.model,
-        temperature=settings.temperature,
-        messages=[
-            {"role": "system", "content": DIAGNOSIS_SYSTEM_PROMPT},
-            {"role": "user", "content": user_content},
-        ],
-    )
-    raw = response.choices[0].message.content or "{}"
+def _build_messages(snapshot: ClusterSnapshot) -> list[dict[str, str]]:
+    """Chat messages for diagnosing one snapshot."""
+    return [_SYSTEM_MESSAGE, {"role": "user", "content": snapshot.to_diagnostic_text()}]
+
+
+def _diagnosis_from_content(raw: str) -> Diagnosis:
+    """Parse model output into a Diagnosis, falling back to no-issue on invalid output."""
     try:
-        data = _parse_llm_json(raw)
-    except json.JSONDecodeError as e:
-        logger.warning("LLM returned invalid JSON, defaulting to no-issue: %s", e)
+        return Diagnosis.model_validate(_parse_llm_json(raw))
+    except (json.JSONDecodeError, ValidationError) as e:
+        logger.warning("LLM returned an invalid diagnosis, defaulting to no-issue: %s", e)
         return Diagnosis(
             has_issue=False,
             summary="Diagnosis could not be parsed; no automated remediation.",
@@ -111,23 +149,156 @@ def diagnose(snapshot: ClusterSnapshot, settings: Settings) -> Diagnosis:
             confidence=0.0,
         )
 
-    actions = []
-    for a in data.get("remediation_actions") or []:
-        if isinstance(a, dict):
-            actions.append(
-                RemediationAction(
-                    kind=_parse_remediation_kind(str(a.get("kind", "custom_instruction"))),
-                    description=str(a.get("description", "")),
-                    target=a.get("target"),
-                    params=a.get("params") or {},
-                    reason=str(a.get("reason", "")),
-                )
-            )
-    return Diagnosis(
-        has_issue=bool(data.get("has_issue", False)),
-        summary=str(data.get("summary", "")),
-        root_cause=str(data.get("root_cause", "")),
-        evidence=[str(x) for x in (data.get("evidence") or [])],
-        remediation_actions=actions,
-        confidence=float(data.get("confidence", 0.0)),
-    )
+
+def _request_kwargs(snapshot: ClusterSnapshot, settings: Settings) -> dict[str, Any]:
+    """chat.completions.create kwargs for diagnosing one snapshot."""
+    return {
+        "model": settings.model,
+        "temperature": settings.temperature,
+        "messages": _build_messages(snapshot),
+        **_completion_kwargs(settings),
+    }
+
+
+def _create(client: OpenAI, kwargs: dict[str, Any]) -> Any:
+    """chat.completions.create, retried once without response_format if the model rejects it."""
+    try:
+        return client.chat.completions.create(**kwargs)
+    except BadRequestError as e:
+        if "response_format" not in kwargs:
+            raise
+        logger.warning("Model %s rejected structured output, retrying without it: %s", kwargs["model"], e.message)
+    kwargs = {k: v for k, v in kwargs.items() if k != "response_format"}
+    response = client.chat.completions.create(**kwargs)
+    _NO_SCHEMA_MODELS.add(kwargs["model"])
+    return response
+
+
+async def _create_async(client: AsyncOpenAI, kwargs: dict[str, Any]) -> Any:
+    """Async variant of _create()."""
+    try:
+        return await client.chat.completions.create(**kwargs)
+    except BadRequestError as e:
+        if "response_format" not in kwargs:
+            raise
+        logger.warning("Model %s rejected structured output, retrying without it: %s", kwargs["model"], e.message)
+    kwargs = {k: v for k, v in kwargs.items() if k != "response_format"}
+    response = await client.chat.completions.create(**kwargs)
+    _NO_SCHEMA_MODELS.add(kwargs["model"])
+    return response
+
+
+class _StreamBuffer:
+    """Accumulates streamed content, reporting each remediation target as soon as it is complete."""
+
+    def __init__(self, on_target: Callable[[str], None]) -> None:
+        self.text = ""
+        self._scanned = 0
+        self._on_target = on_target
+
+    def feed(self, chunk: Any) -> None:
+        if not chunk.choices:
+            return
+        self.text += chunk.choices[0].delta.content or ""
+        for match in _TARGET_RE.finditer(self.text, self._scanned):
+            self._on_target(match.group(1))
+            self._scanned = match.end()
+
+
+def diagnose(
+    snapshot: ClusterSnapshot,
+    settings: Settings,
+    on_target: Callable[[str], None] | None = None,
+) -> Diagnosis:
+    """
+    Run LLM-based diagnosis on a cluster snapshot and return structured Diagnosis.
+    If on_target is given, the response is streamed and on_target is called with each
+    remediation target (e.g. "deployment/myapp") while the model is still generating.
+    """
+    client = _openai_client(settings)
+    kwargs = _request_kwargs(snapshot, settings)
+    if on_target is None:
+        response = _create(client, kwargs)
+        return _diagnosis_from_content(response.choices[0].message.content or "{}")
+    buf = _StreamBuffer(on_target)
+    for chunk in _create(client, {**kwargs, "stream": True}):
+        buf.feed(chunk)
+    return _diagnosis_from_content(buf.text or "{}")
+
+
+# AsyncOpenAI clients tie their connection pool to the event loop that uses them,
+# so shared clients are kept per loop (and dropped with it)
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[Any, ...], AsyncOpenAI]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_openai_client(settings: Settings) -> AsyncOpenAI:
+    """Return the running loop's shared AsyncOpenAI client for the configured provider and endpoint."""
+    key = (settings.llm_provider, settings.openai_base_url, settings.openai_api_key)
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = AsyncOpenAI(**_client_kwargs(*key))
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Close the running loop's shared AsyncOpenAI clients and their connection pools.
+    Call before the loop ends (asyncio.run wrappers here do); later calls on the loop open new ones.
+    """
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.close() for client in clients.values()))
+
+
+async def diagnose_async(
+    snapshot: ClusterSnapshot,
+    settings: Settings,
+    on_target: Callable[[str], None] | None = None,
+) -> Diagnosis:
+    """Async variant of diagnose(): awaits the LLM so other work (e.g. Kubernetes reads) can overlap it."""
+    client = _async_openai_client(settings)
+    kwargs = _request_kwargs(snapshot, settings)
+    if on_target is None:
+        response = await _create_async(client, kwargs)
+        return _diagnosis_from_content(response.choices[0].message.content or "{}")
+    buf = _StreamBuffer(on_target)
+    async for chunk in await _create_async(client, {**kwargs, "stream": True}):
+        buf.feed(chunk)
+    return _diagnosis_from_content(buf.text or "{}")
+
+
+def diagnose_many(
+    snapshots: list[ClusterSnapshot],
+    settings: Settings,
+    concurrency: int | None = None,
+) -> list[Diagnosis]:
+    """
+    Diagnose several snapshots (e.g. one per namespace) with concurrent LLM requests.
+    Up to `concurrency` requests (default: settings.llm_concurrency) are in flight at once
+    so the server can batch them. Results are returned in input order.
+    """
+
+    async def run() -> list[Diagnosis]:
+        try:
+            return await diagnose_many_async(snapshots, settings, concurrency)
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(run())
+
+
+async def diagnose_many_async(
+    snapshots: list[ClusterSnapshot],
+    settings: Settings,
+    concurrency: int | None = None,
+) -> list[Diagnosis]:
+    """Async variant of diagnose_many()."""
+    sem = asyncio.Semaphore(concurrency or settings.llm_concurrency)
+
+    async def one(snapshot: ClusterSnapshot) -> Diagnosis:
+        async with sem:
+            return await diagnose_async(snapshot, settings)
+
+    return await asyncio.gather(*(one(s) for s in snapshots))
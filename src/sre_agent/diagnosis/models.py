@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import math
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 
 
 class RemediationKind(str, Enum):
@@ -31,6 +32,33 @@ class RemediationAction(BaseModel):
     )
     reason: str = Field(default="", description="Why this action is expected to fix the issue")
 
+    @field_validator("kind", mode="before")
+    @classmethod
+    def _unknown_kind_is_custom(cls, v: Any) -> Any:
+        """Treat kinds the agent cannot execute as manual instructions."""
+        try:
+            return RemediationKind(v)
+        except ValueError:
+            return RemediationKind.CUSTOM_INSTRUCTION
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_llm_gaps(cls, data: Any) -> Any:
+        """Accept missing/null/odd fields in LLM output the way a human reader would."""
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        if data.get("kind") is None:
+            data["kind"] = RemediationKind.CUSTOM_INSTRUCTION
+        for key in ("description", "reason"):
+            data[key] = _as_str(data.get(key))
+        target = data.get("target")
+        if target is not None and not isinstance(target, str):
+            data["target"] = str(target)
+        if not isinstance(data.get("params"), dict):
+            data["params"] = {}
+        return data
+
 
 class Diagnosis(BaseModel):
     """Result of root-cause analysis."""
@@ -55,3 +83,65 @@ class Diagnosis(BaseModel):
         le=1.0,
         description="Confidence in the diagnosis (0-1)",
     )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_llm_gaps(cls, data: Any) -> Any:
+        """
+        Accept missing/null/odd fields in LLM output instead of rejecting the diagnosis:
+        a rejected diagnosis falls back to "no issue", which would hide a detected incident.
+        """
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        data["has_issue"] = _as_bool(data.get("has_issue"))
+        for key in ("summary", "root_cause"):
+            data[key] = _as_str(data.get(key))
+        evidence = data.get("evidence")
+        if evidence is None:
+            data["evidence"] = []
+        elif isinstance(evidence, list):
+            data["evidence"] = [_as_str(e) for e in evidence if e is not None]
+        else:
+            data["evidence"] = [_as_str(evidence)]
+        data["confidence"] = _as_confidence(data.get("confidence"))
+        return data
+
+    @field_validator("remediation_actions", mode="before")
+    @classmethod
+    def _drop_malformed_actions(cls, v: Any) -> Any:
+        """Skip actions that still fail validation instead of rejecting the whole diagnosis."""
+        if not isinstance(v, list):
+            return []
+        actions = []
+        for a in v:
+            try:
+                actions.append(a if isinstance(a, RemediationAction) else RemediationAction.model_validate(a))
+            except ValidationError:
+                continue
+        return actions
+
+
+def _as_str(v: Any) -> str:
+    """LLM value as text: null is empty, non-strings are rendered with str()."""
+    if v is None:
+        return ""
+    return v if isinstance(v, str) else str(v)
+
+
+def _as_bool(v: Any) -> bool:
+    """LLM value as a flag: null is False, strings like "false"/"no"/"0" are False."""
+    if isinstance(v, str):
+        return v.strip().lower() not in ("", "false", "no", "n", "0", "off", "none", "null")
+    return bool(v)
+
+
+def _as_confidence(v: Any) -> float:
+    """LLM value as a confidence clamped to [0, 1]; unparseable values are 0."""
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return 0.0
+    if math.isnan(f):
+        return 0.0
+    return min(max(f, 0.0), 1.0)
@@ -7,12 +7,7 @@ import logging
 import sys
 from pathlib import Path
 
-from rich.console import Console
-from rich.logging import RichHandler
-
 from sre_agent import __version__
-from sre_agent.config import get_settings
-from sre_agent.agent import run_agent, print_result
 
 
 def _parse_args() -> argparse.Namespace:
@@ -59,6 +54,14 @@ def _parse_args() -> argparse.Namespace:
 def main() -> int:
     """Entrypoint for sre-agent CLI."""
     args = _parse_args()
+    # Heavy imports (kubernetes, openai, pydantic, rich) happen only after argument parsing,
+    # so --help/--version and usage errors return without loading them
+    from rich.console import Console
+    from rich.logging import RichHandler
+
+    from sre_agent.agent import print_result, run_agent
+    from sre_agent.config import get_settings
+
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.INFO,
         format="%(message)s",
@@ -71,10 +74,14 @@ def main() -> int:
 
     try:
         settings = get_settings()
+        # get_settings() is cached; apply CLI overrides to a copy
+        overrides: dict[str, object] = {}
         if args.kubeconfig:
-            settings.kubeconfig = args.kubeconfig
+            overrides["kubeconfig"] = args.kubeconfig
         if args.dry_run:
-            settings.dry_run = True
+            overrides["dry_run"] = True
+        if overrides:
+            settings = settings.model_copy(update=overrides)
 
         result = run_agent(
             namespace=args.namespace,
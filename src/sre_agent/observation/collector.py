@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import heapq
 import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
+from pydantic import ValidationError
 
+from sre_agent._watch import watch_pods
 from sre_agent.observation.models import (
     ClusterSnapshot,
     ContainerState,
@@ -23,6 +35,83 @@ logger = logging.getLogger(__name__)
 # Default number of log lines to fetch per failing container
 DEFAULT_LOG_TAIL_LINES = 50
 
+# Max concurrent log fetches against the API server, and per-request timeout
+LOG_FETCH_WORKERS = 32
+LOG_FETCH_TIMEOUT_SECONDS = 10
+
+# Unhealthy pods per owner (e.g. ReplicaSet) whose logs are fetched
+MAX_LOG_PODS_PER_OWNER = 2
+
+# Log lines worth sending to the LLM. Other lines are dropped, except the last
+# LOG_CONTEXT_LINES (the context right before a crash), to keep prompts short.
+_LOG_SIGNAL_RE = re.compile(r"error|fatal|panic|exception|oom|killed|traceback|warn", re.IGNORECASE)
+LOG_CONTEXT_LINES = 5
+
+# Caps on log characters per container and per snapshot (newest output is kept)
+MAX_LOG_CHARS_PER_CONTAINER = 4000
+MAX_LOG_CHARS_TOTAL = 8000
+
+# Sort key for events without timestamps
+_MIN_DT = datetime.min.replace(tzinfo=timezone.utc)
+
+# Pods per snapshot (list page size, also applied to the informer cache)
+MAX_PODS = 100
+
+# Informer: watch request timeout (bounds how long close() may take to be noticed),
+# how long collect() waits for the initial list, and retry delay after errors
+INFORMER_WATCH_TIMEOUT_SECONDS = 300
+INFORMER_SYNC_TIMEOUT_SECONDS = 10
+INFORMER_RETRY_SECONDS = 5
+
+
+def _default_cache_dir() -> Path:
+    """Where cached snapshots are stored when ClusterCollector.cache_ttl > 0 and no cache_dir is given.
+    Resolved on use: Path.home() raises when no home directory can be determined."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "sre-agent"
+
+
+def _tail_chars(text: str, limit: int) -> str:
+    """Last `limit` characters of text, starting at a line boundary when cut."""
+    if len(text) <= limit:
+        return text
+    cut = text[len(text) - limit :]
+    newline = cut.find("\n")
+    return cut[newline + 1 :] if newline != -1 else cut
+
+
+def _condense_log(log: str) -> str:
+    """Keep lines matching _LOG_SIGNAL_RE plus the last LOG_CONTEXT_LINES lines."""
+    lines = log.splitlines()
+    tail_start = len(lines) - LOG_CONTEXT_LINES
+    kept = [line for i, line in enumerate(lines) if i >= tail_start or _LOG_SIGNAL_RE.search(line)]
+    return _tail_chars("\n".join(kept), MAX_LOG_CHARS_PER_CONTAINER)
+
+
+def _fit_logs(pod_logs: dict[str, str], budget: int) -> dict[str, str]:
+    """Trim logs to `budget` characters in total, split fairly: short logs stay whole, long ones keep their tail."""
+    if sum(len(log) for log in pod_logs.values()) <= budget:
+        return pod_logs
+    fitted: dict[str, str] = {}
+    remaining = budget
+    left = len(pod_logs)
+    for key in sorted(pod_logs, key=lambda k: len(pod_logs[k])):
+        fitted[key] = _tail_chars(pod_logs[key], remaining // left)
+        remaining -= len(fitted[key])
+        left -= 1
+    return {key: fitted[key] for key in pod_logs}
+
+
+def _log_targets(pod: Any) -> list[tuple[str, str, bool]]:
+    """(pod, container, previous) log targets for a pod. A restarted container that is not
+    running has nothing useful in its current log, so its previous instance is read instead."""
+    statuses = {cs.name: cs for cs in getattr(pod.status, "container_statuses", None) or []}
+    targets = []
+    for c in getattr(pod.spec, "containers", None) or []:
+        cs = statuses.get(c.name)
+        previous = bool(cs and cs.restart_count and not (cs.state and cs.state.running))
+        targets.append((pod.metadata.name, c.name, previous))
+    return targets
+
 
 def _load_kube_config(kubeconfig_path: str | None, context: str | None) -> client.Configuration:
     """Load in-cluster or kubeconfig-based configuration."""
@@ -42,110 +131,110 @@ def _load_kube_config(kubeconfig_path: str | None, context: str | None) -> clien
 
 def _parse_container_state(container_status: Any) -> ContainerState:
     """Extract container state from V1ContainerStatus."""
-    state = "unknown"
-    reason = None
-    message = None
-    exit_code = None
-    if container_status.state and container_status.state.waiting:
-        state = "waiting"
-        reason = getattr(container_status.state.waiting, "reason", None)
-        message = getattr(container_status.state.waiting, "message", None)
-    elif container_status.state and container_status.state.running:
-        state = "running"
-    elif container_status.state and container_status.state.terminated:
-        state = "terminated"
-        reason = getattr(container_status.state.terminated, "reason", None)
-        message = getattr(container_status.state.terminated, "message", None)
-        exit_code = getattr(container_status.state.terminated, "exit_code", None)
-    return ContainerState(
-        state=state,
-        reason=reason,
-        message=message,
-        exit_code=exit_code,
-        restart_count=container_status.restart_count or 0,
-    )
+    restart_count = container_status.restart_count or 0
+    state = container_status.state
+    if state:
+        waiting = state.waiting
+        if waiting:
+            return ContainerState(
+                state="waiting",
+                reason=waiting.reason,
+                message=waiting.message,
+                restart_count=restart_count,
+            )
+        if state.running:
+            return ContainerState(state="running", restart_count=restart_count)
+        terminated = state.terminated
+        if terminated:
+            return ContainerState(
+                state="terminated",
+                reason=terminated.reason,
+                message=terminated.message,
+                exit_code=terminated.exit_code,
+                restart_count=restart_count,
+            )
+    return ContainerState(state="unknown", restart_count=restart_count)
 
 
-def _pod_resource_dict(resources: Any) -> dict[str, str]:
-    """Convert V1ResourceRequirements to dict of resource name -> quantity."""
-    if not resources:
-        return {}
-    out: dict[str, str] = {}
-    for attr in ("requests", "limits"):
-        mapping = getattr(resources, attr, None)
-        if not mapping:
-            continue
-        for k, v in (mapping or {}).items():
-            out[f"{attr}_{k}"] = str(v) if v else ""
-    return out
+def _intern(value: str | None) -> str | None:
+    """Interned copy of a short, frequently repeated API string (condition types, event reasons, ...),
+    or None for a missing or empty value.
 
+    Many pods and events share the same few values; interning keeps one copy of each in memory.
+    """
+    return sys.intern(value) if value else None
+
+
+def _build_pod_summary(pod: Any) -> tuple[PodSummary, bool]:
+    """Build PodSummary from V1Pod. Also returns whether the pod is unhealthy (not Running or not Ready)."""
+    meta = pod.metadata
+    status = pod.status
+    containers = getattr(pod.spec, "containers", None) or []
 
-def _build_pod_summary(pod: Any) -> PodSummary:
-    """Build PodSummary from V1Pod."""
     conditions = []
-    for c in getattr(pod.status, "conditions", []) or []:
+    ready = False
+    for c in getattr(status, "conditions", None) or []:
+        ctype = c.type
+        cstatus = c.status
+        if ctype == "Ready" and cstatus == "True":
+            ready = True
+        last_transition = c.last_transition_time
         conditions.append(
             PodCondition(
-                type=c.type or "",
-                status=c.status or "",
-                reason=getattr(c, "reason", None),
-                message=getattr(c, "message", None),
-                last_transition=(
-                    c.last_transition_time.replace(tzinfo=timezone.utc) if c.last_transition_time else None
-                ),
+                type=_intern(ctype) or "",
+                status=_intern(cstatus) or "",
+                reason=_intern(c.reason),
+                message=c.message,
+                last_transition=last_transition.replace(tzinfo=timezone.utc) if last_transition else None,
             )
         )
-    container_states = []
-    for cs in getattr(pod.status, "container_statuses", []) or []:
-        container_states.append(_parse_container_state(cs))
+    container_states = [_parse_container_state(cs) for cs in getattr(status, "container_statuses", None) or []]
     # If container_statuses is empty but we have spec.containers, add a placeholder
-    if not container_states and getattr(pod.spec, "containers", []):
-        for _ in pod.spec.containers:
-            container_states.append(ContainerState(state="unknown", restart_count=0))
-
-    requests, limits = {}, {}
-    for container in getattr(pod.spec, "containers", []) or []:
-        res = _pod_resource_dict(getattr(container, "resources", None))
-        for k, v in res.items():
-            if k.startswith("requests_"):
-                requests[k.replace("requests_", "")] = v
-            elif k.startswith("limits_"):
-                limits[k.replace("limits_", "")] = v
-
-    return PodSummary(
-        name=pod.metadata.name,
-        namespace=pod.metadata.namespace or "default",
-        phase=getattr(pod.status, "phase", "Unknown") or "Unknown",
-        ready=any(
-            (c.status == "True" and c.type == "Ready")
-            for c in getattr(pod.status, "conditions", []) or []
-        ),
+    if not container_states:
+        container_states = [ContainerState(state="unknown", restart_count=0) for _ in containers]
+
+    requests: dict[str, str] = {}
+    limits: dict[str, str] = {}
+    for container in containers:
+        res = container.resources
+        if not res:
+            continue
+        for k, v in (res.requests or {}).items():
+            requests[k] = str(v) if v else ""
+        for k, v in (res.limits or {}).items():
+            limits[k] = str(v) if v else ""
+
+    created = meta.creation_timestamp
+    phase = getattr(status, "phase", None) or "Unknown"
+    summary = PodSummary(
+        name=meta.name,
+        namespace=meta.namespace or "default",
+        phase=phase,
+        ready=ready,
         conditions=conditions,
         container_states=container_states,
         resource_requests=requests,
         resource_limits=limits,
-        labels=dict(pod.metadata.labels or {}),
-        creation_timestamp=(
-            pod.metadata.creation_timestamp.replace(tzinfo=timezone.utc)
-            if pod.metadata.creation_timestamp
-            else None
-        ),
+        labels=dict(meta.labels or {}),
+        creation_timestamp=created.replace(tzinfo=timezone.utc) if created else None,
     )
+    return summary, phase != "Running" or not ready
 
 
 def _build_event_summary(ev: Any) -> EventSummary:
     """Build EventSummary from CoreV1Event."""
     obj = ev.involved_object
     involved = f"{getattr(obj, 'kind', '')}/{getattr(obj, 'name', '')}"
+    source_component = getattr(ev.source, "component", None) if ev.source else None
     return EventSummary(
-        type=ev.type or "Normal",
-        reason=ev.reason or "",
+        type=_intern(ev.type) or "Normal",
+        reason=_intern(ev.reason) or "",
         message=ev.message or "",
         involved_object=involved,
         count=ev.count or 1,
         first_timestamp=ev.first_timestamp.replace(tzinfo=timezone.utc) if ev.first_timestamp else None,
         last_timestamp=ev.last_timestamp.replace(tzinfo=timezone.utc) if ev.last_timestamp else None,
-        source_component=getattr(ev.source, "component", None) if ev.source else None,
+        source_component=_intern(source_component),
     )
 
 
@@ -172,69 +261,159 @@ class ClusterCollector:
         kubeconfig: str | None = None,
         context: str | None = None,
         log_tail_lines: int = DEFAULT_LOG_TAIL_LINES,
+        cache_ttl: float = 0,
+        cache_dir: Path | None = None,
+        use_informer: bool = False,
     ) -> None:
         self.namespace = namespace
         self.log_tail_lines = log_tail_lines
         cfg = _load_kube_config(kubeconfig, context)
-        self._core = client.CoreV1Api(client.ApiClient(cfg))
-        self._apps = client.AppsV1Api(client.ApiClient(cfg))
+        # Reuse an on-disk snapshot of the same cluster/namespace younger than cache_ttl seconds
+        # (0 disables). The API server and kubeconfig are part of the key: a context name alone
+        # may point at another cluster under a different KUBECONFIG.
+        self.cache_ttl = cache_ttl
+        self._cache_path: Path | None = None
+        if cache_ttl > 0:
+            kubeconfig_path = kubeconfig or os.environ.get("KUBECONFIG", "")
+            key = f"{cfg.host}:{kubeconfig_path}:{context or ''}:{namespace}".encode()
+            name = f"snapshot-{hashlib.sha256(key).hexdigest()[:16]}.json"
+            self._cache_path = (cache_dir or _default_cache_dir()) / name
+        # Let every log worker hold its own keep-alive connection
+        cfg.connection_pool_maxsize = max(cfg.connection_pool_maxsize or 0, LOG_FETCH_WORKERS)
+        # One ApiClient (one urllib3 pool) shared by both APIs so they reuse connections
+        api_client = client.ApiClient(cfg)
+        self._core = client.CoreV1Api(api_client)
+        self._apps = client.AppsV1Api(api_client)
+
+        # Optional pod informer for long-running processes: a background list+watch keeps
+        # _pod_cache current so collect() reads pods from memory instead of listing them
+        self._pod_cache: dict[str, Any] = {}
+        self._pod_cache_lock = threading.Lock()
+        self._pod_cache_synced = threading.Event()
+        self._stopped = threading.Event()
+        self._informer: threading.Thread | None = None
+        self._informer_sync_waited = False
+        if use_informer:
+            self._informer = threading.Thread(
+                target=self._run_pod_informer,
+                name=f"sre-agent-pod-informer-{namespace}",
+                daemon=True,
+            )
+            self._informer.start()
+
+    def close(self) -> None:
+        """Stop the pod informer, if running."""
+        self._stopped.set()
 
     def collect(self) -> ClusterSnapshot:
         """Collect full snapshot for the configured namespace."""
+        return asyncio.run(self.collect_async())
+
+    async def collect_async(self) -> ClusterSnapshot:
+        """Collect full snapshot, issuing independent API calls concurrently."""
+        snapshot = self._read_cache()
+        if snapshot is None:
+            snapshot = await self._collect_live()
+            self._write_cache(snapshot)
+        return snapshot
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached snapshot, e.g. after changing the cluster."""
+        if self._cache_path is not None:
+            self._cache_path.unlink(missing_ok=True)
+
+    def _read_cache(self) -> ClusterSnapshot | None:
+        """Return the cached snapshot if caching is enabled and it is younger than cache_ttl."""
+        if self._cache_path is None:
+            return None
+        try:
+            if time.time() - self._cache_path.stat().st_mtime >= self.cache_ttl:
+                return None
+            snapshot = ClusterSnapshot.model_validate_json(self._cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            logger.debug("Ignoring unreadable snapshot cache %s: %s", self._cache_path, e)
+            return None
+        logger.info("Using cached snapshot from %s", snapshot.collected_at.isoformat())
+        return snapshot
+
+    def _write_cache(self, snapshot: ClusterSnapshot) -> None:
+        """Store snapshot for later runs (atomic replace; failures are non-fatal)."""
+        if self._cache_path is None:
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(snapshot.model_dump_json(), encoding="utf-8")
+            os.replace(tmp, self._cache_path)
+        except OSError as e:
+            logger.debug("Could not write snapshot cache %s: %s", self._cache_path, e)
+
+    async def _collect_live(self) -> ClusterSnapshot:
+        """Query the API server for pods, events, deployments and logs of unhealthy pods."""
+        collected_at = datetime.now(timezone.utc)
         pods: list[PodSummary] = []
         events: list[EventSummary] = []
         deployments: list[DeploymentSummary] = []
-        pod_logs: dict[str, str] = {}
 
+        # Events and deployments keep loading while pods are summarized and their logs fetched
+        event_task = asyncio.create_task(
+            asyncio.to_thread(self._core.list_namespaced_event, namespace=self.namespace, limit=50)
+        )
+        dep_task = asyncio.create_task(
+            asyncio.to_thread(self._apps.list_namespaced_deployment, namespace=self.namespace, limit=50)
+        )
         try:
-            pod_list = self._core.list_namespaced_pod(
-                namespace=self.namespace,
-                limit=100,
-            )
-            for pod in pod_list.items:
-                pods.append(_build_pod_summary(pod))
-                # Collect logs for non-ready or non-running pods
-                if not self._pod_healthy(pod):
-                    for c in getattr(pod.spec, "containers", []) or []:
-                        cname = c.name
-                        try:
-                            log = self._core.read_namespaced_pod_log(
-                                name=pod.metadata.name,
-                                namespace=self.namespace,
-                                container=cname,
-                                tail_lines=self.log_tail_lines,
-                                timestamps=False,
-                            )
-                            key = f"{pod.metadata.name}/{cname}"
-                            pod_logs[key] = log or ""
-                        except ApiException as e:
-                            pod_logs[f"{pod.metadata.name}/{cname}"] = f"(failed to get logs: {e.reason})"
-        except ApiException as e:
-            logger.warning("Failed to list pods: %s", e.reason)
+            pod_list = await asyncio.to_thread(self._list_pods)
+        except BaseException as e:
+            if isinstance(e, ApiException):
+                logger.warning("Failed to list pods: %s", e.reason)
+            event_task.cancel()
+            dep_task.cancel()
+            await asyncio.gather(event_task, dep_task, return_exceptions=True)
             raise
 
-        try:
-            event_list = self._core.list_namespaced_event(
-                namespace=self.namespace,
-                limit=50,
-            )
-            # Sort by last_timestamp descending (most recent first)
-            items = sorted(
+        # Collect logs for non-ready or non-running pods; replicas of one owner usually
+        # fail identically, so only the first few per owner are fetched
+        log_targets: list[tuple[str, str, bool]] = []
+        pods_per_owner: dict[str, int] = {}
+        for pod in pod_list:
+            summary, needs_logs = _build_pod_summary(pod)
+            pods.append(summary)
+            if not needs_logs:
+                continue
+            owners = pod.metadata.owner_references
+            if owners:
+                seen = pods_per_owner.get(owners[0].uid, 0)
+                if seen >= MAX_LOG_PODS_PER_OWNER:
+                    continue
+                pods_per_owner[owners[0].uid] = seen + 1
+            log_targets.extend(_log_targets(pod))
+        pod_logs = _fit_logs(await asyncio.to_thread(self._fetch_logs, log_targets), MAX_LOG_CHARS_TOTAL)
+        event_list, dep_list = await asyncio.gather(event_task, dep_task, return_exceptions=True)
+
+        if isinstance(event_list, ApiException):
+            logger.warning("Failed to list events: %s", event_list.reason)
+        elif isinstance(event_list, BaseException):
+            raise event_list
+        else:
+            # 30 most recent by last_timestamp, newest first (same order as a full descending sort)
+            items = heapq.nlargest(
+                30,
                 event_list.items,
-                key=lambda x: (x.last_timestamp or x.first_timestamp or datetime.min.replace(tzinfo=timezone.utc)),
-                reverse=True,
+                key=lambda x: x.last_timestamp or x.first_timestamp or _MIN_DT,
             )
-            for ev in items[:30]:
+            for ev in items:
                 events.append(_build_event_summary(ev))
-        except ApiException as e:
-            logger.warning("Failed to list events: %s", e.reason)
 
-        try:
-            dep_list = self._apps.list_namespaced_deployment(namespace=self.namespace, limit=50)
+        if isinstance(dep_list, ApiException):
+            logger.warning("Failed to list deployments: %s", dep_list.reason)
+        elif isinstance(dep_list, BaseException):
+            raise dep_list
+        else:
             for d in dep_list.items:
                 deployments.append(_build_deployment_summary(d))
-        except ApiException as e:
-            logger.warning("Failed to list deployments: %s", e.reason)
 
         return ClusterSnapshot(
             namespace=self.namespace,
@@ -242,14 +421,91 @@ class ClusterCollector:
             events=events,
             deployments=deployments,
             pod_logs=pod_logs,
-            collected_at=datetime.now(timezone.utc),
+            collected_at=collected_at,
         )
 
-    def _pod_healthy(self, pod: Any) -> bool:
-        """Return True if pod is running and ready."""
-        if getattr(pod.status, "phase", None) != "Running":
-            return False
-        for c in getattr(pod.status, "conditions", []) or []:
-            if c.type == "Ready" and c.status == "True":
-                return True
-        return False
+    def _list_pods(self) -> list[Any]:
+        """Pods in the namespace, from the informer cache once synced, else from the API server."""
+        if self._informer is not None and not self._informer_sync_waited:
+            # Wait for the initial sync only once: if the informer cannot sync (e.g. watch is
+            # forbidden), later calls list directly instead of stalling again
+            self._informer_sync_waited = True
+            self._pod_cache_synced.wait(INFORMER_SYNC_TIMEOUT_SECONDS)
+        if self._pod_cache_synced.is_set():
+            with self._pod_cache_lock:
+                names = sorted(self._pod_cache)[:MAX_PODS]
+                return [self._pod_cache[name] for name in names]
+        return self._core.list_namespaced_pod(namespace=self.namespace, limit=MAX_PODS).items
+
+    def _run_pod_informer(self) -> None:
+        """List pods, then apply watch events to _pod_cache; relist when the watch expires (410 Gone)."""
+        resource_version: str | None = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    pod_list = self._core.list_namespaced_pod(namespace=self.namespace)
+                    with self._pod_cache_lock:
+                        self._pod_cache = {p.metadata.name: p for p in pod_list.items}
+                    resource_version = pod_list.metadata.resource_version
+                    self._pod_cache_synced.set()
+                resource_version = watch_pods(
+                    self._core,
+                    self.namespace,
+                    resource_version,
+                    INFORMER_WATCH_TIMEOUT_SECONDS,
+                    self._apply_pod_event,
+                )
+            except ApiException as e:
+                if e.status == 410:
+                    resource_version = None
+                    continue
+                logger.warning("Pod informer for %s failed: %s; retrying", self.namespace, e.reason)
+                resource_version = None
+                self._stopped.wait(INFORMER_RETRY_SECONDS)
+            except Exception as e:
+                logger.warning("Pod informer for %s failed: %s; retrying", self.namespace, e)
+                resource_version = None
+                self._stopped.wait(INFORMER_RETRY_SECONDS)
+
+    def _apply_pod_event(self, event_type: str, pod: Any) -> bool:
+        """Apply one watch event to _pod_cache; returns True to end the watch once closed."""
+        with self._pod_cache_lock:
+            if event_type == "DELETED":
+                self._pod_cache.pop(pod.metadata.name, None)
+            else:
+                self._pod_cache[pod.metadata.name] = pod
+        return self._stopped.is_set()
+
+    def _fetch_logs(self, targets: list[tuple[str, str, bool]]) -> dict[str, str]:
+        """Fetch log tails for (pod, container, previous) targets on a bounded thread pool."""
+        if not targets:
+            return {}
+
+        def read(pod_name: str, cname: str, previous: bool) -> str:
+            return self._core.read_namespaced_pod_log(
+                name=pod_name,
+                namespace=self.namespace,
+                container=cname,
+                previous=previous,
+                tail_lines=self.log_tail_lines,
+                timestamps=False,
+                _request_timeout=LOG_FETCH_TIMEOUT_SECONDS,
+            )
+
+        def fetch(target: tuple[str, str, bool]) -> tuple[str, str]:
+            pod_name, cname, previous = target
+            key = f"{pod_name}/{cname}"
+            try:
+                if previous:
+                    try:
+                        return f"{key} (previous run)", _condense_log(read(pod_name, cname, True) or "")
+                    except ApiException as e:
+                        # No terminated instance to read (400); fall back to the current one
+                        if e.status != 400:
+                            raise
+                return key, _condense_log(read(pod_name, cname, False) or "")
+            except ApiException as e:
+                return key, f"(failed to get logs: {e.reason})"
+
+        with ThreadPoolExecutor(max_workers=min(LOG_FETCH_WORKERS, len(targets))) as executor:
+            return dict(executor.map(fetch, targets))
@@ -1,14 +1,28 @@
-"""Structured models for Kubernetes cluster state used by the agent."""
+"""Structured models for Kubernetes cluster state used by the agent.
+
+Per-object summaries are built by the collector from trusted API objects, so they are
+plain slotted dataclasses (no validation on construction); ClusterSnapshot stays a
+Pydantic model for rendering and serialization.
+"""
 
 from __future__ import annotations
 
+import io
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Final
+
+from pydantic import BaseModel, ConfigDict, Field
 
-from pydantic import BaseModel, Field
+# Section headers of to_diagnostic_text, each with the blank line that separates it from the previous section
+_PODS_HEADER: Final = "\n\n## Pods"
+_EVENTS_HEADER: Final = "\n\n## Events (recent)"
+_DEPLOYMENTS_HEADER: Final = "\n\n## Deployments"
+_LOGS_HEADER: Final = "\n\n## Pod logs (tail)"
 
 
-class PodCondition(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PodCondition:
     """Pod condition summary."""
 
     type: str
@@ -18,7 +32,8 @@ class PodCondition(BaseModel):
     last_transition: datetime | None = None
 
 
-class ContainerState(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ContainerState:
     """Container state summary (waiting, running, terminated)."""
 
     state: str  # waiting | running | terminated
@@ -28,22 +43,24 @@ class ContainerState(BaseModel):
     restart_count: int = 0
 
 
-class PodSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PodSummary:
     """Summary of a pod for diagnosis."""
 
     name: str
     namespace: str
     phase: str
     ready: bool
-    conditions: list[PodCondition] = Field(default_factory=list)
-    container_states: list[ContainerState] = Field(default_factory=list)
-    resource_requests: dict[str, str] = Field(default_factory=dict)
-    resource_limits: dict[str, str] = Field(default_factory=dict)
-    labels: dict[str, str] = Field(default_factory=dict)
+    conditions: list[PodCondition] = field(default_factory=list)
+    container_states: list[ContainerState] = field(default_factory=list)
+    resource_requests: dict[str, str] = field(default_factory=dict)
+    resource_limits: dict[str, str] = field(default_factory=dict)
+    labels: dict[str, str] = field(default_factory=dict)
     creation_timestamp: datetime | None = None
 
 
-class EventSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class EventSummary:
     """Kubernetes event summary."""
 
     type: str  # Normal | Warning
@@ -56,7 +73,8 @@ class EventSummary(BaseModel):
     source_component: str | None = None
 
 
-class DeploymentSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DeploymentSummary:
     """Deployment state summary."""
 
     name: str
@@ -65,12 +83,16 @@ class DeploymentSummary(BaseModel):
     ready_replicas: int
     available_replicas: int
     unavailable_replicas: int
-    conditions: list[dict[str, Any]] = Field(default_factory=list)
+    conditions: list[dict[str, Any]] = field(default_factory=list)
 
 
 class ClusterSnapshot(BaseModel):
     """Full snapshot of relevant cluster state for a namespace."""
 
+    # Build the validator on first use rather than at import (the CLI imports this before it needs it).
+    # Frozen like the summaries it holds: a snapshot is a read-only record of one collection sweep.
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     namespace: str
     pods: list[PodSummary] = Field(default_factory=list)
     events: list[EventSummary] = Field(default_factory=list)
@@ -79,34 +101,90 @@ class ClusterSnapshot(BaseModel):
         default_factory=dict,
         description="pod_name -> tail of recent logs (last N lines)",
     )
-    collected_at: datetime = Field(default_factory=datetime.utcnow)
+    collected_at: datetime  # start of the collection sweep, supplied by the collector
 
     def to_diagnostic_text(self) -> str:
-        """Render snapshot as structured text for LLM consumption."""
-        lines = [
-            f"# Cluster snapshot (namespace={self.namespace}, collected_at={self.collected_at.isoformat()})",
-            "",
-            "## Pods",
-        ]
+        """Render snapshot as structured text for LLM consumption.
+
+        Fields at their default (restart_count=0, count=1, no reason/message, ...) are
+        omitted: they carry no signal and every rendered character is prompt input, as are
+        empty Events/Deployments sections. Text is written straight into one buffer rather
+        than built as a list of per-line strings.
+        """
+        buf = io.StringIO()
+        write: Callable[[str], int] = buf.write
+        write("# Cluster snapshot (namespace=")
+        write(self.namespace)
+        write(", collected_at=")
+        write(self.collected_at.isoformat())
+        write(")")
+        write(_PODS_HEADER)
         for p in self.pods:
-            lines.append(f"- {p.name}: phase={p.phase}, ready={p.ready}")
+            write("\n- ")
+            write(p.name)
+            write(": phase=")
+            write(p.phase)
+            write(", ready=True" if p.ready else ", ready=False")
             for c in p.container_states:
-                extra = f", reason={c.reason}, message={c.message}" if c.reason or c.message else ""
-                lines.append(f"  container state={c.state}, restart_count={c.restart_count}{extra}")
-            if p.resource_requests or p.resource_limits:
-                lines.append(f"  requests={p.resource_requests}, limits={p.resource_limits}")
-        lines.extend(["", "## Events (recent)"])
-        for e in self.events:
-            lines.append(f"- [{e.type}] {e.reason}: {e.message} (object={e.involved_object}, count={e.count})")
-        lines.extend(["", "## Deployments"])
-        for d in self.deployments:
-            lines.append(
-                f"- {d.name}: desired={d.desired_replicas}, ready={d.ready_replicas}, "
-                f"available={d.available_replicas}, unavailable={d.unavailable_replicas}"
-            )
+                write("\n  container state=")
+                write(c.state)
+                if c.restart_count:
+                    write(f", restart_count={c.restart_count}")
+                if c.reason:
+                    write(", reason=")
+                    write(c.reason)
+                if c.message:
+                    write(", message=")
+                    write(c.message)
+                if c.exit_code is not None:
+                    write(f", exit_code={c.exit_code}")
+            if p.resource_requests:
+                write("\n  requests: ")
+                _write_quantities(write, p.resource_requests)
+                if p.resource_limits:
+                    write("; limits: ")
+                    _write_quantities(write, p.resource_limits)
+            elif p.resource_limits:
+                write("\n  limits: ")
+                _write_quantities(write, p.resource_limits)
+        if self.events:
+            write(_EVENTS_HEADER)
+            for e in self.events:
+                write("\n- [")
+                write(e.type)
+                write("] ")
+                write(e.reason)
+                write(": ")
+                write(e.message)
+                write(" (object=")
+                write(e.involved_object)
+                write(f", count={e.count})" if e.count > 1 else ")")
+        if self.deployments:
+            write(_DEPLOYMENTS_HEADER)
+            for d in self.deployments:
+                write(
+                    f"\n- {d.name}: desired={d.desired_replicas}, ready={d.ready_replicas}, "
+                    f"available={d.available_replicas}"
+                )
+                if d.unavailable_replicas:
+                    write(f", unavailable={d.unavailable_replicas}")
         if self.pod_logs:
-            lines.extend(["", "## Pod logs (tail)"])
+            write(_LOGS_HEADER)
             for pod_name, log in self.pod_logs.items():
-                lines.append(f"### {pod_name}")
-                lines.append(log if log.strip() else "(no logs)")
-        return "\n".join(lines)
+                write("\n### ")
+                write(pod_name)
+                write("\n")
+                # isspace() stops at the first non-blank character; strip() would copy a log with edge whitespace
+                write(log if log and not log.isspace() else "(no logs)")
+        return buf.getvalue()
+
+
+def _write_quantities(write: Callable[[str], int], resources: dict[str, str]) -> None:
+    """Write {"cpu": "100m", "memory": "64Mi"} as "cpu=100m, memory=64Mi"."""
+    sep = ""
+    for name, quantity in resources.items():
+        write(sep)
+        write(name)
+        write("=")
+        write(quantity)
+        sep = ", "
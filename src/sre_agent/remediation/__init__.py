@@ -1,8 +1,15 @@
 """Remediation layer: apply corrective actions and verify cluster health."""
 
-from sre_agent.remediation.actions import apply_remediation, verify_healthy
+from sre_agent.remediation.actions import (
+    apply_remediation,
+    prefetch_deployment,
+    verify_healthy,
+    verify_healthy_wait,
+)
 
 __all__ = [
     "apply_remediation",
+    "prefetch_deployment",
     "verify_healthy",
+    "verify_healthy_wait",
 ]
@@ -3,48 +3,248 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
 
 from kubernetes import client, config
-from kubernetes.client import V1EnvVar, V1ResourceRequirements
+from kubernetes.client import V1ObjectMeta, V1Scale, V1ScaleSpec
 from kubernetes.client.rest import ApiException
 
+from sre_agent._json import json_loads
+from sre_agent._watch import watch_pods
 from sre_agent.diagnosis.models import RemediationAction, RemediationKind
 
 logger = logging.getLogger(__name__)
 
+# patch_deployment_resources param -> (resources section, resource name)
+_RESOURCE_PARAMS: dict[str, tuple[str, str]] = {
+    "memory_limit": ("limits", "memory"),
+    "memory_request": ("requests", "memory"),
+    "cpu_limit": ("limits", "cpu"),
+    "cpu_request": ("requests", "cpu"),
+}
+
+# Reused across verify_healthy calls so polling does not spawn threads each time
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sre-verify")
+
+# verify_healthy_wait: while every pod is healthy but deployments lag (their status is updated
+# after pods turn Ready, with no further pod events), re-check deployments this often
+DEPLOYMENT_RECHECK_SECONDS = 2
+
 
 def _get_api_client(kubeconfig: str | None = None, context: str | None = None) -> tuple[client.CoreV1Api, client.AppsV1Api]:
-    """Load kubeconfig and return Core and Apps API clients."""
+    """Return shared Core and Apps API clients for the given kubeconfig/context."""
+    return _cached_clients(str(kubeconfig) if kubeconfig else None, context)
+
+
+@lru_cache(maxsize=8)
+def _cached_clients(kubeconfig: str | None, context: str | None) -> tuple[client.CoreV1Api, client.AppsV1Api]:
+    """Load kubeconfig and build API clients; reused so their connection pools stay warm."""
     try:
         config.load_incluster_config()
     except config.ConfigException:
         kwargs: dict[str, Any] = {}
         if kubeconfig:
-            kwargs["config_file"] = str(kubeconfig)
+            kwargs["config_file"] = kubeconfig
         if context:
             kwargs["context"] = context
         config.load_kube_config(**kwargs)
-    cfg = client.Configuration.get_default_copy()
-    return client.CoreV1Api(client.ApiClient(cfg)), client.AppsV1Api(client.ApiClient(cfg))
+    # One ApiClient (one connection pool) serves both API groups
+    api_client = client.ApiClient(client.Configuration.get_default_copy())
+    return client.CoreV1Api(api_client), client.AppsV1Api(api_client)
 
 
 def _parse_target(target: str | None, namespace: str) -> tuple[str | None, str | None]:
     """Parse 'deployment/name' or 'pod/name' into kind and name."""
-    if not target or "/" not in target:
+    if not target:
+        return None, None
+    kind, sep, name = target.strip().lower().partition("/")
+    if not sep:
         return None, None
-    kind, name = target.strip().lower().split("/", 1)
     return kind, name
 
 
+def _patch_containers(apps: client.AppsV1Api, name: str, namespace: str, containers: list[dict[str, Any]]) -> None:
+    """
+    Strategic-merge-patch the given pod template containers of a deployment.
+    Containers are matched by name and only the fields present are changed, so the body
+    stays small and carries no resourceVersion to conflict on.
+    """
+    apps.patch_namespaced_deployment(
+        name=name,
+        namespace=namespace,
+        body={"spec": {"template": {"spec": {"containers": containers}}}},
+        _content_type="application/strategic-merge-patch+json",
+    )
+
+
+def prefetch_deployment(
+    target: str | None,
+    namespace: str,
+    kubeconfig: str | None = None,
+    context: str | None = None,
+) -> Any | None:
+    """
+    Read the deployment named by a remediation target ahead of apply_remediation.
+    Best effort: returns None for non-deployment targets or if the read fails.
+    """
+    kind, name = _parse_target(target, namespace)
+    if kind != "deployment" or not name:
+        return None
+    try:
+        _, apps = _get_api_client(kubeconfig, context)
+        return apps.read_namespaced_deployment(name=name, namespace=namespace)
+    except Exception as e:
+        logger.debug("Prefetch of %s failed: %s", target, e)
+        return None
+
+
+# Handler signature: (core, apps, name, namespace, action, prefetched deployment or None)
+_Handler = Callable[[client.CoreV1Api, client.AppsV1Api, str, str, RemediationAction, Any], tuple[bool, str]]
+
+
+def _delete_pod(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Delete the pod so its controller recreates it."""
+    try:
+        core.delete_namespaced_pod(name=name, namespace=namespace)
+        return True, f"Deleted pod {name}"
+    except ApiException as e:
+        if e.status == 404:
+            return True, f"Pod {name} already gone (not found); no action needed"
+        raise
+
+
+def _patch_env(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Set env vars from action.params on every container of the deployment."""
+    env_vars = action.params
+    if not env_vars:
+        return False, "patch_deployment_env requires params with env var key/values"
+    dep = dep or apps.read_namespaced_deployment(name=name, namespace=namespace)
+    # Set the same env on every container; the apiserver merges env entries by name.
+    # One list is built and shared by all containers (it is only serialized).
+    env = [{"name": k, "value": str(v)} for k, v in env_vars.items()]
+    containers = [{"name": c.name, "env": env} for c in dep.spec.template.spec.containers]
+    _patch_containers(apps, name, namespace, containers)
+    return True, f"Patched deployment {name} with env vars: {list(env_vars.keys())}"
+
+
+def _patch_resources(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Set memory/CPU limits and requests of the deployment's first container."""
+    # Only the sections and quantities being changed; limits/requests are maps merged
+    # key by key, so unchanged quantities are kept
+    resources: dict[str, dict[str, Any]] = {}
+    for param, (section, resource) in _RESOURCE_PARAMS.items():
+        if param in action.params:
+            resources.setdefault(section, {})[resource] = action.params[param]
+    if not resources:
+        return False, f"patch_deployment_resources requires one of {list(_RESOURCE_PARAMS)} in params"
+    dep = dep or apps.read_namespaced_deployment(name=name, namespace=namespace)
+    container = {"name": dep.spec.template.spec.containers[0].name, "resources": resources}
+    _patch_containers(apps, name, namespace, [container])
+    return True, f"Patched deployment {name} resources"
+
+
+def _patch_image_or_cmd(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Set image, command and/or args of the deployment's first container."""
+    dep = dep or apps.read_namespaced_deployment(name=name, namespace=namespace)
+    container = {"name": dep.spec.template.spec.containers[0].name}
+    if "image" in action.params:
+        container["image"] = action.params["image"]
+    if "command" in action.params:
+        cmd = action.params["command"]
+        container["command"] = [cmd] if isinstance(cmd, str) else cmd
+    if "args" in action.params:
+        args = action.params["args"]
+        container["args"] = [args] if isinstance(args, str) else args
+    _patch_containers(apps, name, namespace, [container])
+    return True, f"Patched deployment {name} image/command/args"
+
+
+def _scale(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Scale the deployment through its /scale subresource."""
+    replicas = action.params.get("replicas")
+    if replicas is None:
+        return False, "scale_deployment requires params.replicas"
+    scale = V1Scale(
+        metadata=V1ObjectMeta(name=name, namespace=namespace),
+        spec=V1ScaleSpec(replicas=int(replicas)),
+    )
+    apps.patch_namespaced_deployment_scale(name=name, namespace=namespace, body=scale)
+    return True, f"Scaled deployment {name} to {replicas} replicas"
+
+
+def _custom_instruction(
+    core: client.CoreV1Api,
+    apps: client.AppsV1Api,
+    name: str,
+    namespace: str,
+    action: RemediationAction,
+    dep: Any,
+) -> tuple[bool, str]:
+    """Nothing to execute; report the manual step."""
+    return True, f"Manual: {action.description}"
+
+
+# Action kind -> (target kind it applies to, or None for any; handler)
+_DISPATCH: dict[RemediationKind, tuple[str | None, _Handler]] = {
+    RemediationKind.DELETE_POD: ("pod", _delete_pod),
+    RemediationKind.PATCH_DEPLOYMENT_ENV: ("deployment", _patch_env),
+    RemediationKind.PATCH_DEPLOYMENT_RESOURCES: ("deployment", _patch_resources),
+    RemediationKind.PATCH_DEPLOYMENT_IMAGE_OR_CMD: ("deployment", _patch_image_or_cmd),
+    RemediationKind.SCALE_DEPLOYMENT: ("deployment", _scale),
+    RemediationKind.CUSTOM_INSTRUCTION: (None, _custom_instruction),
+}
+
+
 def apply_remediation(
     action: RemediationAction,
     namespace: str,
     kubeconfig: str | None = None,
     context: str | None = None,
+    prefetched: dict[str, Any] | None = None,
 ) -> tuple[bool, str]:
     """
     Apply a single remediation action. Returns (success, message).
+    prefetched maps deployment name -> V1Deployment read earlier (see prefetch_deployment);
+    only its container names are used. An entry is consumed when used, so later actions on
+    the same deployment read fresh state.
     """
     core, apps = _get_api_client(kubeconfig, context)
     kind, name = _parse_target(action.target, namespace)
@@ -52,89 +252,28 @@ def apply_remediation(
         if action.kind == RemediationKind.CUSTOM_INSTRUCTION:
             return True, f"Manual: {action.description}"
         return False, f"Invalid or missing target: {action.target}"
+    entry = _DISPATCH.get(action.kind)
+    if entry is None or entry[0] not in (None, kind):
+        return False, f"Unsupported action kind or target: {action.kind} for {action.target}"
+    handler = entry[1]
+    prefetched_dep = prefetched.pop(name, None) if prefetched and kind == "deployment" else None
 
     try:
-        if action.kind == RemediationKind.DELETE_POD and kind == "pod":
-            try:
-                core.delete_namespaced_pod(name=name, namespace=namespace)
-                return True, f"Deleted pod {name}"
-            except ApiException as e:
-                if e.status == 404:
-                    return True, f"Pod {name} already gone (not found); no action needed"
-                raise
-
-        if action.kind == RemediationKind.PATCH_DEPLOYMENT_ENV and kind == "deployment":
-            dep = apps.read_namespaced_deployment(name=name, namespace=namespace)
-            env_vars = action.params
-            if not env_vars:
-                return False, "patch_deployment_env requires params with env var key/values"
-            # Build env list for all containers (apply same env to each for simplicity)
-            for container in dep.spec.template.spec.containers:
-                existing = {e.name: e for e in (container.env or [])}
-                for k, v in env_vars.items():
-                    existing[k] = V1EnvVar(name=k, value=str(v))
-                container.env = list(existing.values())
-            apps.patch_namespaced_deployment(
-                name=name,
-                namespace=namespace,
-                body=dep,
-            )
-            return True, f"Patched deployment {name} with env vars: {list(env_vars.keys())}"
-
-        if action.kind == RemediationKind.PATCH_DEPLOYMENT_RESOURCES and kind == "deployment":
-            dep = apps.read_namespaced_deployment(name=name, namespace=namespace)
-            res = dep.spec.template.spec.containers[0].resources or V1ResourceRequirements()
-            limits = dict(res.limits or {})
-            requests = dict(res.requests or {})
-            if "memory_limit" in action.params:
-                limits["memory"] = action.params["memory_limit"]
-            if "memory_request" in action.params:
-                requests["memory"] = action.params["memory_request"]
-            if "cpu_limit" in action.params:
-                limits["cpu"] = action.params["cpu_limit"]
-            if "cpu_request" in action.params:
-                requests["cpu"] = action.params["cpu_request"]
-            res.limits = limits
-            res.requests = requests
-            dep.spec.template.spec.containers[0].resources = res
-            apps.patch_namespaced_deployment(name=name, namespace=namespace, body=dep)
-            return True, f"Patched deployment {name} resources"
-
-        if action.kind == RemediationKind.PATCH_DEPLOYMENT_IMAGE_OR_CMD and kind == "deployment":
-            dep = apps.read_namespaced_deployment(name=name, namespace=namespace)
-            c = dep.spec.template.spec.containers[0]
-            if "image" in action.params:
-                c.image = action.params["image"]
-            if "command" in action.params:
-                cmd = action.params["command"]
-                c.command = [cmd] if isinstance(cmd, str) else cmd
-            if "args" in action.params:
-                args = action.params["args"]
-                c.args = [args] if isinstance(args, str) else args
-            apps.patch_namespaced_deployment(name=name, namespace=namespace, body=dep)
-            return True, f"Patched deployment {name} image/command/args"
-
-        if action.kind == RemediationKind.SCALE_DEPLOYMENT and kind == "deployment":
-            replicas = action.params.get("replicas")
-            if replicas is None:
-                return False, "scale_deployment requires params.replicas"
-            from kubernetes.client import V1Scale
-            scale = V1Scale(
-                metadata=client.V1ObjectMeta(name=name, namespace=namespace),
-                spec=client.V1ScaleSpec(replicas=int(replicas)),
-            )
-            apps.patch_namespaced_deployment_scale(name=name, namespace=namespace, body=scale)
-            return True, f"Scaled deployment {name} to {replicas} replicas"
-
-        if action.kind == RemediationKind.CUSTOM_INSTRUCTION:
-            return True, f"Manual: {action.description}"
-
-        return False, f"Unsupported action kind or target: {action.kind} for {action.target}"
+        return handler(core, apps, name, namespace, action, prefetched_dep)
     except ApiException as e:
         logger.exception("Remediation failed: %s", e.body)
         return False, f"API error: {e.reason} - {e.body}"
 
 
+def _list_items(list_fn: Callable[..., Any], **kwargs: Any) -> list[dict[str, Any]]:
+    """
+    Call a list_* API method and return its items as plain JSON dicts (camelCase keys).
+    Skips building the generated model objects, of which verify_healthy reads a few fields.
+    """
+    resp = list_fn(_preload_content=False, **kwargs)
+    return json_loads(resp.data)["items"]
+
+
 def verify_healthy(
     namespace: str,
     kubeconfig: str | None = None,
@@ -148,20 +287,104 @@ def verify_healthy(
     """
     core, apps = _get_api_client(kubeconfig, context)
     try:
-        pods = core.list_namespaced_pod(namespace=namespace, limit=100)
-        for pod in pods.items:
-            if pod.status.phase != "Running":
-                return False, f"Pod {pod.metadata.name} is not Running (phase={pod.status.phase})"
-            ready = any(
-                c.type == "Ready" and c.status == "True"
-                for c in (pod.status.conditions or [])
-            )
-            if not ready:
-                return False, f"Pod {pod.metadata.name} is not Ready"
-        deps = apps.list_namespaced_deployment(namespace=namespace, limit=100)
-        for d in deps.items:
-            if (d.status.ready_replicas or 0) != (d.status.replicas or 0):
-                return False, f"Deployment {d.metadata.name}: ready_replicas != desired"
+        return _check_healthy(core, apps, namespace)
     except ApiException as e:
         return False, f"API error: {e.reason}"
+
+
+def _check_healthy(core: client.CoreV1Api, apps: client.AppsV1Api, namespace: str) -> tuple[bool, str]:
+    """verify_healthy's check; API errors propagate as ApiException."""
+    # The deployment list is independent of the pod checks; overlap its round-trip with them
+    deps_future = _VERIFY_POOL.submit(_list_items, apps.list_namespaced_deployment, namespace=namespace, limit=100)
+    try:
+        # Filter server-side: any pod outside Running fails the check, so one item is enough
+        for pod in _list_items(
+            core.list_namespaced_pod, namespace=namespace, field_selector="status.phase!=Running", limit=1
+        ):
+            return False, f"Pod {pod['metadata']['name']} is not Running (phase={pod['status'].get('phase')})"
+        pods = _list_items(core.list_namespaced_pod, namespace=namespace, field_selector="status.phase=Running", limit=100)
+        for pod in pods:
+            ready = False
+            for c in pod["status"].get("conditions", ()):
+                if c["type"] == "Ready":
+                    ready = c["status"] == "True"
+                    break
+            if not ready:
+                return False, f"Pod {pod['metadata']['name']} is not Ready"
+        for d in deps_future.result():
+            # Compare against spec: status.replicas also counts surge pods of a rollout in progress
+            if d["status"].get("readyReplicas", 0) < d["spec"].get("replicas", 0):
+                return False, f"Deployment {d['metadata']['name']}: ready_replicas < desired"
+    finally:
+        deps_future.cancel()
     return True, "All pods running and ready; deployments satisfied."
+
+
+def _pod_problem(pod: Any) -> str | None:
+    """Why a pod (client model) is unhealthy, or None if it is Running and Ready."""
+    status = pod.status
+    if status.phase != "Running":
+        return f"Pod {pod.metadata.name} is not Running (phase={status.phase})"
+    for c in status.conditions or ():
+        if c.type == "Ready":
+            if c.status == "True":
+                return None
+            break
+    return f"Pod {pod.metadata.name} is not Ready"
+
+
+def verify_healthy_wait(
+    namespace: str,
+    kubeconfig: str | None = None,
+    context: str | None = None,
+    timeout_seconds: int = 120,
+) -> tuple[bool, str]:
+    """
+    Wait up to timeout_seconds for the namespace to become healthy (see verify_healthy).
+    Pod state is seeded by one list and then kept current from a watch, so waiting costs one
+    namespace list plus the pod changes instead of a full list every poll interval.
+    Deployments are checked as in verify_healthy() whenever every pod is Running and Ready,
+    and every DEPLOYMENT_RECHECK_SECONDS while only deployments are still catching up.
+    Returns (healthy, message); on timeout the message says what is still unhealthy.
+    """
+    core, apps = _get_api_client(kubeconfig, context)
+    deadline = time.monotonic() + timeout_seconds
+    problems: dict[str, str] = {}  # pod name -> why it is unhealthy
+    resource_version: str | None = None
+
+    def apply_event(event_type: str, pod: Any) -> bool:
+        problem = None if event_type == "DELETED" else _pod_problem(pod)
+        if problem:
+            problems[pod.metadata.name] = problem
+            return False
+        problems.pop(pod.metadata.name, None)
+        # Once every pod is healthy, stop watching and go check deployments
+        return not problems
+
+    while True:
+        try:
+            if resource_version is None:
+                pod_list = core.list_namespaced_pod(namespace=namespace)
+                problems = {}
+                for pod in pod_list.items:
+                    problem = _pod_problem(pod)
+                    if problem:
+                        problems[pod.metadata.name] = problem
+                resource_version = pod_list.metadata.resource_version
+            if problems:
+                message = next(iter(problems.values()))
+            else:
+                # An API error here (e.g. listing deployments is forbidden) ends the wait below
+                healthy, message = _check_healthy(core, apps, namespace)
+                if healthy:
+                    return True, message
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, message
+            watch_seconds = remaining if problems else min(remaining, DEPLOYMENT_RECHECK_SECONDS)
+            resource_version = watch_pods(core, namespace, resource_version, max(1, round(watch_seconds)), apply_event)
+        except ApiException as e:
+            if e.status == 410:
+                resource_version = None
+                continue
+            return False, f"API error: {e.reason}"
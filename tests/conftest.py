@@ -0,0 +1,33 @@
+"""Shared fixtures."""
+
+import pytest
+from kubernetes import client
+
+from sre_agent.observation import collector as collector_mod
+
+
+@pytest.fixture
+def make_collector(monkeypatch, tmp_path):
+    """
+    Factory for ClusterCollectors on namespace "ns" whose Core and Apps APIs are `api` (a fake)
+    and whose kubeconfig resolves to `host`. Extra kwargs go to ClusterCollector; the snapshot
+    cache lives under tmp_path. Collectors are closed at teardown.
+    """
+    collectors: list[collector_mod.ClusterCollector] = []
+
+    def make(api: object = None, host: str = "https://k8s.test:6443", **kwargs) -> collector_mod.ClusterCollector:
+        def load_kube_config(kubeconfig, context):
+            cfg = client.Configuration()
+            cfg.host = host
+            return cfg
+
+        monkeypatch.setattr(collector_mod, "_load_kube_config", load_kube_config)
+        monkeypatch.setattr(collector_mod.client, "CoreV1Api", lambda api_client: api)
+        monkeypatch.setattr(collector_mod.client, "AppsV1Api", lambda api_client: api)
+        kwargs.setdefault("cache_dir", tmp_path)
+        collectors.append(collector_mod.ClusterCollector(namespace="ns", **kwargs))
+        return collectors[-1]
+
+    yield make
+    for c in collectors:
+        c.close()
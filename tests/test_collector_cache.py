@@ -0,0 +1,33 @@
+"""ClusterCollector snapshot cache keying and location."""
+
+from pathlib import Path
+
+
+def test_cache_is_keyed_by_cluster_and_kubeconfig(make_collector, monkeypatch):
+    def cache_path(host: str, **kw):
+        return make_collector(host=host, cache_ttl=60, context="prod", **kw)._cache_path
+
+    monkeypatch.delenv("KUBECONFIG", raising=False)
+    a = cache_path("https://a:6443")
+    assert a == cache_path("https://a:6443")
+    assert a != cache_path("https://b:6443")
+    assert a != cache_path("https://a:6443", kubeconfig="/other/config")
+    monkeypatch.setenv("KUBECONFIG", "/other/config")
+    assert a != cache_path("https://a:6443")
+
+
+def test_cache_off_does_not_resolve_home(make_collector, monkeypatch):
+    def no_home():
+        raise RuntimeError("Could not determine home directory.")
+
+    monkeypatch.setattr(Path, "home", no_home)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    c = make_collector(cache_dir=None)
+    assert c._cache_path is None
+    c.invalidate_cache()
+
+
+def test_default_cache_dir_follows_xdg(make_collector, monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    c = make_collector(cache_dir=None, cache_ttl=60)
+    assert c._cache_path.parent == tmp_path / "xdg" / "sre-agent"
@@ -0,0 +1,103 @@
+"""ClusterCollector's optional pod informer, against a fake API server and watch."""
+
+import threading
+import time
+from types import SimpleNamespace as NS
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from sre_agent import _watch
+from sre_agent.observation import collector as collector_mod
+
+
+def _pod(name: str, rv: str) -> NS:
+    return NS(metadata=NS(name=name, resource_version=rv))
+
+
+class FakeCore:
+    def __init__(self, forbid_informer: bool = False) -> None:
+        self.forbid_informer = forbid_informer
+        self.informer_lists = 0
+        self.direct_lists = 0
+
+    def list_namespaced_pod(self, namespace, **kw):
+        if "limit" in kw:
+            self.direct_lists += 1
+            return NS(items=[_pod("direct", "1")])
+        self.informer_lists += 1
+        if self.forbid_informer:
+            raise ApiException(status=403, reason="Forbidden")
+        return NS(items=[_pod("a", "5")], metadata=NS(resource_version="10"))
+
+
+@pytest.fixture
+def fake_watch(monkeypatch):
+    """
+    Scripted pod watch: each watch opened pops the next list of events from the returned script;
+    past the end it blocks until teardown. Request it before make_collector so collectors are
+    closed first and the released watch ends their informer.
+    """
+    script: list[list[dict]] = []
+    streams: list[dict] = []
+    released = threading.Event()
+
+    class FakeWatch:
+        def stream(self, func, **kw):
+            streams.append(kw)
+            if script:
+                yield from script.pop(0)
+            else:
+                released.wait(5)
+
+        def stop(self) -> None:
+            pass
+
+    monkeypatch.setattr(_watch.watch, "Watch", FakeWatch)
+    yield script, streams
+    released.set()
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def _bookmark(rv: str) -> dict:
+    # The client does not deserialize bookmarks: "object" is the raw dict
+    obj = {"kind": "Pod", "metadata": {"resourceVersion": rv}}
+    return {"type": "BOOKMARK", "object": obj, "raw_object": obj}
+
+
+def test_bookmark_advances_version_without_relisting(fake_watch, make_collector):
+    script, streams = fake_watch
+    script += [
+        [_bookmark("20"), {"type": "ADDED", "object": _pod("b", "21"), "raw_object": {}}],
+        [_bookmark("30")],
+    ]
+    core = FakeCore()
+    c = make_collector(core, use_informer=True)
+    _wait_for(lambda: len(streams) == 3)
+    assert [s["resource_version"] for s in streams] == ["10", "21", "30"]
+    assert core.informer_lists == 1
+    assert [p.metadata.name for p in c._list_pods()] == ["a", "b"]
+    assert core.direct_lists == 0
+
+
+def test_unsynced_informer_is_waited_for_once(fake_watch, make_collector, monkeypatch):
+    monkeypatch.setattr(collector_mod, "INFORMER_SYNC_TIMEOUT_SECONDS", 0.3)
+    core = FakeCore(forbid_informer=True)
+    c = make_collector(core, use_informer=True)
+
+    start = time.monotonic()
+    assert [p.metadata.name for p in c._list_pods()] == ["direct"]
+    first = time.monotonic() - start
+    start = time.monotonic()
+    assert [p.metadata.name for p in c._list_pods()] == ["direct"]
+    second = time.monotonic() - start
+
+    assert first >= 0.3
+    assert second < 0.1
+    assert core.direct_lists == 2
@@ -0,0 +1,57 @@
+"""ClusterCollector live collection ordering and error handling."""
+
+import threading
+from types import SimpleNamespace as NS
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from sre_agent.observation import collector as collector_mod
+
+
+class FakeApi:
+    """Pods list immediately (or fail); events block until log fetching has started."""
+
+    def __init__(self, pod_error: Exception | None = None) -> None:
+        self.pod_error = pod_error
+        self.logs_started = threading.Event()
+        self.events_waited_for_logs: bool | None = None
+
+    def list_namespaced_pod(self, namespace, **kw):
+        if self.pod_error:
+            raise self.pod_error
+        return NS(items=[])
+
+    def list_namespaced_event(self, namespace, **kw):
+        self.events_waited_for_logs = self.logs_started.wait(2)
+        return NS(items=[])
+
+    def list_namespaced_deployment(self, namespace, **kw):
+        return NS(items=[])
+
+
+@pytest.fixture
+def live_collector(make_collector, monkeypatch):
+    def make(api: FakeApi) -> collector_mod.ClusterCollector:
+        def fetch_logs(self, targets):
+            api.logs_started.set()
+            return {}
+
+        monkeypatch.setattr(collector_mod.ClusterCollector, "_fetch_logs", fetch_logs)
+        return make_collector(api)
+
+    return make
+
+
+def test_logs_are_fetched_without_waiting_for_events(live_collector):
+    api = FakeApi()
+    snapshot = live_collector(api).collect()
+    assert snapshot.pods == [] and snapshot.events == []
+    assert api.events_waited_for_logs is True
+
+
+def test_pod_list_failure_is_raised(live_collector):
+    api = FakeApi(pod_error=ApiException(status=403, reason="Forbidden"))
+    api.logs_started.set()  # don't hold up the events call being abandoned
+    with pytest.raises(ApiException):
+        live_collector(api).collect()
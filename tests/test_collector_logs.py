@@ -0,0 +1,140 @@
+"""Selection and trimming of the pod logs sent to the LLM."""
+
+from types import SimpleNamespace as NS
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from sre_agent.observation.collector import (
+    LOG_CONTEXT_LINES,
+    MAX_LOG_CHARS_PER_CONTAINER,
+    _condense_log,
+    _fit_logs,
+    _log_targets,
+    _tail_chars,
+)
+
+
+def _pod(name: str, owner_uid: str = "rs-1", restarts: int = 0, running: bool = False) -> client.V1Pod:
+    """An unhealthy single-container pod owned by owner_uid."""
+    state = (
+        client.V1ContainerState(running=client.V1ContainerStateRunning())
+        if running
+        else client.V1ContainerState(waiting=client.V1ContainerStateWaiting(reason="CrashLoopBackOff"))
+    )
+    return client.V1Pod(
+        metadata=client.V1ObjectMeta(
+            name=name,
+            namespace="ns",
+            owner_references=[
+                client.V1OwnerReference(api_version="apps/v1", kind="ReplicaSet", name=owner_uid, uid=owner_uid)
+            ],
+        ),
+        spec=client.V1PodSpec(containers=[client.V1Container(name="app")]),
+        status=client.V1PodStatus(
+            phase="Running",
+            conditions=[client.V1PodCondition(type="Ready", status="False")],
+            container_statuses=[
+                client.V1ContainerStatus(
+                    name="app", image="app:1", image_id="", ready=False, restart_count=restarts, state=state
+                )
+            ],
+        ),
+    )
+
+
+class FakeApi:
+    """Serves pods and their logs; previous-run reads fail with previous_error when set."""
+
+    def __init__(self, pods: list[client.V1Pod], previous_error: ApiException | None = None) -> None:
+        self.pods = pods
+        self.previous_error = previous_error
+        self.log_reads: list[tuple[str, bool]] = []
+
+    def list_namespaced_pod(self, namespace, **kw):
+        return NS(items=self.pods)
+
+    def list_namespaced_event(self, namespace, **kw):
+        return NS(items=[])
+
+    def list_namespaced_deployment(self, namespace, **kw):
+        return NS(items=[])
+
+    def read_namespaced_pod_log(self, name, namespace, container, previous, **kw):
+        self.log_reads.append((name, previous))
+        if previous and self.previous_error:
+            raise self.previous_error
+        return f"{'previous' if previous else 'current'} log of {name}\n"
+
+
+def test_tail_chars_cuts_at_line_boundary():
+    assert _tail_chars("short", 10) == "short"
+    assert _tail_chars("aaaa\nbbbb\ncccc", 7) == "cccc"
+
+
+def test_tail_chars_keeps_end_of_single_long_line():
+    assert _tail_chars("x" * 10 + "END", 5) == "xxEND"
+
+
+def test_condense_log_keeps_signal_lines_and_context():
+    lines = [f"info {i}" for i in range(20)]
+    lines[3] = "ERROR connection refused"
+    condensed = _condense_log("\n".join(lines)).splitlines()
+    assert condensed == ["ERROR connection refused"] + lines[-LOG_CONTEXT_LINES:]
+
+
+def test_condense_log_caps_container_output():
+    log = "\n".join(f"error {i:05d}" for i in range(2000))
+    condensed = _condense_log(log)
+    assert len(condensed) <= MAX_LOG_CHARS_PER_CONTAINER
+    assert condensed.endswith("error 01999")
+    assert condensed.startswith("error ")
+
+
+def test_fit_logs_under_budget_is_unchanged():
+    logs = {"a": "x" * 10, "b": "y" * 10}
+    assert _fit_logs(logs, 20) is logs
+
+
+def test_fit_logs_keeps_short_log_whole_and_tail_of_long_one():
+    long = "\n".join(f"line {i:03d}" for i in range(100))
+    fitted = _fit_logs({"long": long, "short": "s" * 10}, 100)
+    assert list(fitted) == ["long", "short"]
+    assert fitted["short"] == "s" * 10
+    assert len(fitted["long"]) <= 90
+    assert fitted["long"].endswith("line 099")
+    assert fitted["long"].startswith("line ")
+
+
+def test_log_targets_reads_previous_run_of_restarted_container():
+    assert _log_targets(_pod("p", restarts=3)) == [("p", "app", True)]
+    assert _log_targets(_pod("p", restarts=3, running=True)) == [("p", "app", False)]
+    assert _log_targets(_pod("p")) == [("p", "app", False)]
+
+
+def test_logs_fetched_for_few_pods_per_owner(make_collector):
+    pods = [_pod("web-1"), _pod("web-2"), _pod("web-3"), _pod("db-1", owner_uid="rs-2")]
+    api = FakeApi(pods)
+    snapshot = make_collector(api).collect()
+    assert len(snapshot.pods) == 4
+    # web-3 is the third replica of rs-1 (MAX_LOG_PODS_PER_OWNER is 2)
+    assert sorted(snapshot.pod_logs) == ["db-1/app", "web-1/app", "web-2/app"]
+
+
+def test_previous_run_falls_back_to_current_log_on_400(make_collector):
+    api = FakeApi([_pod("web-1", restarts=2)], previous_error=ApiException(status=400, reason="Bad Request"))
+    snapshot = make_collector(api).collect()
+    assert snapshot.pod_logs == {"web-1/app": "current log of web-1"}
+    assert api.log_reads == [("web-1", True), ("web-1", False)]
+
+
+def test_previous_run_is_labelled(make_collector):
+    api = FakeApi([_pod("web-1", restarts=2)])
+    snapshot = make_collector(api).collect()
+    assert snapshot.pod_logs == {"web-1/app (previous run)": "previous log of web-1"}
+
+
+def test_other_log_errors_are_reported(make_collector):
+    api = FakeApi([_pod("web-1", restarts=2)], previous_error=ApiException(status=403, reason="Forbidden"))
+    snapshot = make_collector(api).collect()
+    assert snapshot.pod_logs == {"web-1/app": "(failed to get logs: Forbidden)"}
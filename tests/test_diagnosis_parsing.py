@@ -0,0 +1,111 @@
+"""Parsing of LLM diagnosis output into Diagnosis."""
+
+import json
+
+import pytest
+
+from sre_agent.diagnosis.analyzer import _diagnosis_from_content
+from sre_agent.diagnosis.models import RemediationKind
+
+FALLBACK_SUMMARY = "Diagnosis could not be parsed; no automated remediation."
+
+
+def _parse(data: object):
+    return _diagnosis_from_content(json.dumps(data))
+
+
+def test_action_without_description_is_kept():
+    d = _parse(
+        {
+            "has_issue": True,
+            "summary": "crash",
+            "remediation_actions": [{"kind": "delete_pod", "target": "pod/web-1"}],
+        }
+    )
+    assert d.has_issue
+    assert len(d.remediation_actions) == 1
+    assert d.remediation_actions[0].kind == RemediationKind.DELETE_POD
+    assert d.remediation_actions[0].description == ""
+
+
+def test_missing_has_issue_is_false():
+    d = _parse({"summary": "looks fine"})
+    assert not d.has_issue
+    assert d.summary == "looks fine"
+
+
+def test_null_summary_keeps_detected_issue():
+    d = _parse({"has_issue": True, "summary": None, "root_cause": None})
+    assert d.has_issue
+    assert d.summary == ""
+    assert d.root_cause == ""
+
+
+def test_non_string_evidence_is_stringified():
+    d = _parse({"has_issue": True, "summary": "s", "evidence": [{"a": 1}, 2, None, "log line"]})
+    assert d.has_issue
+    assert d.evidence == ["{'a': 1}", "2", "log line"]
+
+
+def test_bad_action_is_dropped_not_the_diagnosis():
+    d = _parse(
+        {
+            "has_issue": True,
+            "summary": "s",
+            "remediation_actions": [
+                None,
+                5,
+                {"kind": "scale_deployment", "target": "deployment/web", "params": None},
+                {"kind": "something_new", "description": "call the DBA"},
+                {"kind": "delete_pod", "target": "pod/a", "description": ["not", "text"]},
+            ],
+        }
+    )
+    assert d.has_issue
+    kinds = [a.kind for a in d.remediation_actions]
+    assert kinds == [
+        RemediationKind.SCALE_DEPLOYMENT,
+        RemediationKind.CUSTOM_INSTRUCTION,
+        RemediationKind.DELETE_POD,
+    ]
+    assert d.remediation_actions[0].params == {}
+
+
+@pytest.mark.parametrize(
+    ("confidence", "expected"),
+    [(1.7, 1.0), (-0.2, 0.0), ("0.8", 0.8), ("high", 0.0), (None, 0.0), (0.42, 0.42)],
+)
+def test_confidence_is_clamped(confidence, expected):
+    d = _parse({"has_issue": True, "summary": "s", "confidence": confidence})
+    assert d.has_issue
+    assert d.confidence == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(("value", "expected"), [("false", False), ("yes", True), (None, False), (1, True)])
+def test_has_issue_coercion(value, expected):
+    assert _parse({"has_issue": value, "summary": "s"}).has_issue is expected
+
+
+def test_fenced_json_is_parsed():
+    d = _diagnosis_from_content('```json\n{"has_issue": true, "summary": "s"}\n```')
+    assert d.has_issue
+
+
+@pytest.mark.parametrize("raw", ["not json", "[1, 2]"])
+def test_unusable_output_falls_back_to_no_issue(raw):
+    d = _diagnosis_from_content(raw)
+    assert not d.has_issue
+    assert d.summary == FALLBACK_SUMMARY
+
+
+def test_numbers_are_accepted_as_strings():
+    d = _parse(
+        {
+            "has_issue": True,
+            "summary": 500,
+            "remediation_actions": [{"kind": "scale_deployment", "target": 7, "description": 1.5}],
+        }
+    )
+    assert d.summary == "500"
+    assert d.remediation_actions[0].target == "7"
+    assert d.remediation_actions[0].description == "1.5"
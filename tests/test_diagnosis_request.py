@@ -0,0 +1,85 @@
+"""Diagnosis requests to the LLM provider."""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace as NS
+
+import pytest
+from openai import BadRequestError
+
+from sre_agent.config import Settings
+from sre_agent.diagnosis import analyzer
+from sre_agent.observation.models import ClusterSnapshot
+
+CONTENT = json.dumps({"has_issue": True, "summary": "crash"})
+
+
+class FakeCompletions:
+    """Rejects response_format like models without structured-output support."""
+
+    def __init__(self, supports_schema: bool) -> None:
+        self.supports_schema = supports_schema
+        self.calls: list[dict] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if "response_format" in kwargs and not self.supports_schema:
+            # Duck-typed HTTP response: only these attributes are read by the error
+            response = NS(request=None, status_code=400, headers={})
+            raise BadRequestError("response_format json_schema is not supported with this model", response=response, body=None)
+        return NS(choices=[NS(message=NS(content=CONTENT))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    def install(supports_schema: bool) -> FakeCompletions:
+        fake = FakeCompletions(supports_schema)
+        monkeypatch.setattr(analyzer, "_openai_client", lambda settings: NS(chat=NS(completions=fake)))
+        monkeypatch.setattr(analyzer, "_NO_SCHEMA_MODELS", set())
+        return fake
+
+    return install
+
+
+def _diagnose(model: str):
+    settings = Settings(_env_file=None, llm_provider="openai", model=model)
+    snapshot = ClusterSnapshot(namespace="ns", collected_at=datetime.now(timezone.utc))
+    return analyzer.diagnose(snapshot, settings)
+
+
+def test_structured_output_is_requested(completions):
+    fake = completions(supports_schema=True)
+    assert _diagnose("gpt-4o-mini").has_issue
+    assert [("response_format" in c) for c in fake.calls] == [True]
+
+
+def test_model_without_structured_output_falls_back_once(completions):
+    fake = completions(supports_schema=False)
+    assert _diagnose("gpt-4").has_issue
+    assert _diagnose("gpt-4").has_issue
+    # The rejection is remembered: only the first request is sent with the schema
+    assert [("response_format" in c) for c in fake.calls] == [True, False, False]
+
+
+def test_diagnose_many_closes_its_clients(monkeypatch):
+    created = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **kwargs) -> None:
+            self.closed = False
+            self.chat = NS(completions=NS(create=self.create))
+            created.append(self)
+
+        async def create(self, **kwargs):
+            return NS(choices=[NS(message=NS(content=CONTENT))])
+
+        async def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(analyzer, "AsyncOpenAI", FakeAsyncOpenAI)
+    settings = Settings(_env_file=None, llm_provider="openai", model="gpt-4o-mini")
+    snapshot = ClusterSnapshot(namespace="ns", collected_at=datetime.now(timezone.utc))
+    diagnoses = analyzer.diagnose_many([snapshot, snapshot], settings)
+    assert [d.has_issue for d in diagnoses] == [True, True]
+    assert len(created) == 1 and created[0].closed
+    assert len(analyzer._async_clients) == 0
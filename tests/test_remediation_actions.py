@@ -0,0 +1,148 @@
+"""apply_remediation against fake Core and Apps APIs."""
+
+from types import SimpleNamespace as NS
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from sre_agent.diagnosis.models import RemediationAction, RemediationKind
+from sre_agent.remediation import actions
+
+STRATEGIC_MERGE = "application/strategic-merge-patch+json"
+
+
+def _container_patch(name: str, *containers: dict) -> dict:
+    """The patch_namespaced_deployment call expected for a strategic merge of containers."""
+    body = {"spec": {"template": {"spec": {"containers": list(containers)}}}}
+    return {"name": name, "body": body, "_content_type": STRATEGIC_MERGE}
+
+
+def _deployment(*containers: str) -> NS:
+    return NS(spec=NS(template=NS(spec=NS(containers=[NS(name=c) for c in containers]))))
+
+
+class FakeApi:
+    """Records writes; reads return a deployment with the given containers."""
+
+    def __init__(self, *containers: str) -> None:
+        self.containers = containers or ("app",)
+        self.reads: list[str] = []
+        self.patches: list[dict] = []
+        self.deleted: list[str] = []
+
+    def read_namespaced_deployment(self, name, namespace):
+        self.reads.append(name)
+        return _deployment(*self.containers)
+
+    def patch_namespaced_deployment(self, name, namespace, body, **kw):
+        self.patches.append({"name": name, "body": body, **kw})
+
+    def patch_namespaced_deployment_scale(self, name, namespace, body):
+        self.patches.append({"name": name, "replicas": body.spec.replicas})
+
+    def delete_namespaced_pod(self, name, namespace):
+        if name == "gone":
+            raise ApiException(status=404, reason="Not Found")
+        self.deleted.append(name)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi("app", "sidecar")
+    monkeypatch.setattr(actions, "_get_api_client", lambda *a, **k: (fake, fake))
+    return fake
+
+
+def _apply(kind: RemediationKind, target: str, params: dict | None = None, **kw):
+    action = RemediationAction(kind=kind, description="d", target=target, params=params or {})
+    return actions.apply_remediation(action, "ns", **kw)
+
+
+def test_patch_env_sets_env_on_every_container(api):
+    ok, _ = _apply(RemediationKind.PATCH_DEPLOYMENT_ENV, "deployment/web", {"REQUIRED_CONFIG": "x", "PORT": 8080})
+    assert ok
+    env = [{"name": "REQUIRED_CONFIG", "value": "x"}, {"name": "PORT", "value": "8080"}]
+    assert api.patches == [_container_patch("web", {"name": "app", "env": env}, {"name": "sidecar", "env": env})]
+
+
+def test_patch_resources_sends_only_changed_quantities(api):
+    ok, _ = _apply(
+        RemediationKind.PATCH_DEPLOYMENT_RESOURCES,
+        "deployment/web",
+        {"memory_limit": "256Mi", "cpu_request": "100m", "unrelated": "x"},
+    )
+    assert ok
+    container = {"name": "app", "resources": {"limits": {"memory": "256Mi"}, "requests": {"cpu": "100m"}}}
+    assert api.patches == [_container_patch("web", container)]
+
+
+def test_patch_resources_without_known_params_is_rejected(api):
+    ok, message = _apply(RemediationKind.PATCH_DEPLOYMENT_RESOURCES, "deployment/web", {"memory": "1Gi"})
+    assert not ok
+    assert "requires one of" in message
+    assert api.patches == [] and api.reads == []
+
+
+def test_patch_image_or_cmd_wraps_string_command(api):
+    ok, _ = _apply(
+        RemediationKind.PATCH_DEPLOYMENT_IMAGE_OR_CMD,
+        "deployment/web",
+        {"image": "web:2", "command": "/bin/web", "args": ["--port", "80"]},
+    )
+    assert ok
+    container = {"name": "app", "image": "web:2", "command": ["/bin/web"], "args": ["--port", "80"]}
+    assert api.patches == [_container_patch("web", container)]
+
+
+def test_prefetched_deployment_is_used_once(api):
+    prefetched = {"web": _deployment("prefetched")}
+    _apply(RemediationKind.PATCH_DEPLOYMENT_IMAGE_OR_CMD, "deployment/web", {"image": "web:2"}, prefetched=prefetched)
+    assert prefetched == {}
+    assert api.reads == []
+    assert api.patches == [_container_patch("web", {"name": "prefetched", "image": "web:2"})]
+
+    # The entry was consumed: the next action on the deployment reads fresh state
+    _apply(RemediationKind.PATCH_DEPLOYMENT_IMAGE_OR_CMD, "deployment/web", {"image": "web:3"}, prefetched=prefetched)
+    assert api.reads == ["web"]
+    assert api.patches[1] == _container_patch("web", {"name": "app", "image": "web:3"})
+
+
+def test_scale_uses_scale_subresource(api):
+    assert _apply(RemediationKind.SCALE_DEPLOYMENT, "deployment/web", {"replicas": "3"})[0]
+    assert api.patches == [{"name": "web", "replicas": 3}]
+
+
+def test_delete_pod(api):
+    assert _apply(RemediationKind.DELETE_POD, "pod/web-1") == (True, "Deleted pod web-1")
+    assert _apply(RemediationKind.DELETE_POD, "pod/gone")[0]
+    assert api.deleted == ["web-1"]
+
+
+@pytest.mark.parametrize(
+    ("kind", "target"),
+    [
+        (RemediationKind.DELETE_POD, "deployment/web"),
+        (RemediationKind.PATCH_DEPLOYMENT_ENV, "pod/web-1"),
+        (RemediationKind.SCALE_DEPLOYMENT, "service/web"),
+    ],
+)
+def test_kind_and_target_mismatch_is_rejected(api, kind, target):
+    ok, message = _apply(kind, target, {"replicas": 1, "A": "b"})
+    assert not ok
+    assert message.startswith("Unsupported action kind or target")
+    assert api.patches == [] and api.deleted == [] and api.reads == []
+
+
+def test_custom_instruction_without_target_is_reported(api):
+    action = RemediationAction(kind=RemediationKind.CUSTOM_INSTRUCTION, description="rotate the DB password")
+    assert actions.apply_remediation(action, "ns") == (True, "Manual: rotate the DB password")
+
+
+def test_api_error_is_reported(api, monkeypatch):
+    def forbidden(**kw):
+        raise ApiException(status=403, reason="Forbidden")
+
+    monkeypatch.setattr(api, "patch_namespaced_deployment", forbidden)
+    ok, message = _apply(RemediationKind.PATCH_DEPLOYMENT_ENV, "deployment/web", {"A": "b"})
+    assert not ok
+    assert message.startswith("API error: Forbidden")
@@ -0,0 +1,200 @@
+"""verify_healthy_wait against a fake API server and watch."""
+
+import json
+from types import SimpleNamespace as NS
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from sre_agent import _watch
+from sre_agent.remediation import actions
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeCluster:
+    """Pods and deployments; list calls return client-model-like objects or raw JSON."""
+
+    def __init__(self, clock: FakeClock, pods: dict[str, tuple[str, bool]], ready_replicas=lambda now: 1):
+        self.clock = clock
+        self.pods = pods  # name -> (phase, ready)
+        self.ready_replicas = ready_replicas
+        self.pod_lists = 0
+
+    def pod(self, name: str, rv: str = "1") -> NS:
+        phase, ready = self.pods.get(name, ("Running", True))
+        return NS(
+            metadata=NS(name=name, resource_version=rv),
+            status=NS(phase=phase, conditions=[NS(type="Ready", status="True" if ready else "False")]),
+        )
+
+    def list_namespaced_pod(self, namespace, **kw):
+        if kw.get("watch"):
+            raise AssertionError("watch requests go through the fake Watch")
+        names = list(self.pods)
+        selector = kw.get("field_selector")
+        if selector == "status.phase!=Running":
+            names = [n for n in names if self.pods[n][0] != "Running"]
+        elif selector == "status.phase=Running":
+            names = [n for n in names if self.pods[n][0] == "Running"]
+        if kw.get("_preload_content") is False:
+            items = [
+                {
+                    "metadata": {"name": n},
+                    "status": {
+                        "phase": self.pods[n][0],
+                        "conditions": [{"type": "Ready", "status": "True" if self.pods[n][1] else "False"}],
+                    },
+                }
+                for n in names
+            ]
+            return NS(data=json.dumps({"items": items}).encode())
+        self.pod_lists += 1
+        return NS(items=[self.pod(n) for n in names], metadata=NS(resource_version="10"))
+
+    def list_namespaced_deployment(self, namespace, **kw):
+        ready = self.ready_replicas(self.clock.now)
+        status = {"readyReplicas": ready} if ready else {}
+        items = [{"metadata": {"name": "web"}, "spec": {"replicas": 1}, "status": status}]
+        return NS(data=json.dumps({"items": items}).encode())
+
+
+def install(monkeypatch, cluster: FakeCluster, clock: FakeClock, script: list) -> list[dict]:
+    """
+    Patch the module to use the fake cluster. Each watch opened pops the next script entry:
+    a list of (type, pod name or resourceVersion) events, an exception to raise, or a callable
+    returning either when the watch opens. ADDED and MODIFIED events make the pod Running and
+    Ready. An empty watch advances the clock by its timeout, as the server closes it then.
+    """
+    calls: list[dict] = []
+
+    class FakeWatch:
+        def __init__(self) -> None:
+            self.stopped = False
+
+        def stream(self, func, **kw):
+            calls.append(kw)
+            entry = script.pop(0) if script else []
+            if callable(entry):
+                entry = entry()
+            if isinstance(entry, Exception):
+                raise entry
+            for etype, value in entry:
+                if etype == "BOOKMARK":
+                    obj = {"kind": "Pod", "metadata": {"resourceVersion": value}}
+                    yield {"type": etype, "object": obj, "raw_object": obj}
+                else:
+                    if etype == "DELETED":
+                        obj = cluster.pod(value)
+                        del cluster.pods[value]
+                    else:
+                        cluster.pods[value] = ("Running", True)
+                        obj = cluster.pod(value)
+                    yield {"type": etype, "object": obj, "raw_object": {}}
+                if self.stopped:
+                    return
+            # A watch with no events runs to its timeout; one that had events was closed early
+            clock.now += 1 if entry else kw["timeout_seconds"]
+
+        def stop(self) -> None:
+            self.stopped = True
+
+    monkeypatch.setattr(actions, "_get_api_client", lambda *a, **k: (cluster, cluster))
+    monkeypatch.setattr(_watch.watch, "Watch", FakeWatch)
+    monkeypatch.setattr(actions, "time", NS(monotonic=clock.monotonic))
+    return calls
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_healthy_namespace_returns_without_watching(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", True)})
+    calls = install(monkeypatch, cluster, clock, [])
+    assert actions.verify_healthy_wait("ns", timeout_seconds=60) == (
+        True,
+        "All pods running and ready; deployments satisfied.",
+    )
+    assert calls == []
+
+
+def test_pod_becoming_ready_ends_the_wait(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", False)})
+    calls = install(monkeypatch, cluster, clock, [[("MODIFIED", "web-1")]])
+    healthy, _ = actions.verify_healthy_wait("ns", timeout_seconds=60)
+    assert healthy
+    assert len(calls) == 1
+    assert clock.now == 0
+
+
+def test_bookmark_advances_resource_version(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", False)})
+    calls = install(monkeypatch, cluster, clock, [[("BOOKMARK", "42")], [("MODIFIED", "web-1")]])
+    healthy, _ = actions.verify_healthy_wait("ns", timeout_seconds=60)
+    assert healthy
+    assert [c["resource_version"] for c in calls] == ["10", "42"]
+    assert cluster.pod_lists == 1
+
+
+def test_expired_watch_relists(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", False)})
+
+    def gone():
+        cluster.pods["web-1"] = ("Running", True)
+        return ApiException(status=410, reason="Gone")
+
+    calls = install(monkeypatch, cluster, clock, [gone])
+    # The pod recovered while the watch was failing; the relist must notice
+    healthy, _ = actions.verify_healthy_wait("ns", timeout_seconds=60)
+    assert healthy
+    assert cluster.pod_lists == 2
+    assert len(calls) == 1
+
+
+def test_deleted_unhealthy_pod_is_forgotten(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", True), "web-0": ("Pending", False)})
+    install(monkeypatch, cluster, clock, [[("DELETED", "web-0")]])
+    healthy, _ = actions.verify_healthy_wait("ns", timeout_seconds=60)
+    assert healthy
+
+
+def test_lagging_deployment_is_rechecked_promptly(monkeypatch, clock):
+    # Pods are all Ready; the deployment reports them a few seconds later, with no pod events
+    cluster = FakeCluster(clock, {"web-1": ("Running", True)}, ready_replicas=lambda now: 1 if now >= 3 else 0)
+    calls = install(monkeypatch, cluster, clock, [])
+    healthy, _ = actions.verify_healthy_wait("ns", timeout_seconds=120)
+    assert healthy
+    assert clock.now <= 3 + actions.DEPLOYMENT_RECHECK_SECONDS
+    assert all(c["timeout_seconds"] <= actions.DEPLOYMENT_RECHECK_SECONDS for c in calls)
+
+
+def test_timeout_reports_unhealthy_pod(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", False)})
+    install(monkeypatch, cluster, clock, [])
+    assert actions.verify_healthy_wait("ns", timeout_seconds=30) == (False, "Pod web-1 is not Ready")
+    assert clock.now == 30
+
+
+def test_api_error_is_reported(monkeypatch, clock):
+    cluster = FakeCluster(clock, {"web-1": ("Running", False)})
+    install(monkeypatch, cluster, clock, [ApiException(status=403, reason="Forbidden")])
+    assert actions.verify_healthy_wait("ns", timeout_seconds=30) == (False, "API error: Forbidden")
+
+
+def test_deployment_api_error_is_reported_at_once(monkeypatch, clock):
+    def forbidden(now):
+        raise ApiException(status=403, reason="Forbidden")
+
+    cluster = FakeCluster(clock, {"web-1": ("Running", True)}, ready_replicas=forbidden)
+    calls = install(monkeypatch, cluster, clock, [])
+    assert actions.verify_healthy_wait("ns", timeout_seconds=120) == (False, "API error: Forbidden")
+    assert calls == []
+    assert clock.now == 0